@@ -1,6 +1,8 @@
 import os
 from typing import Optional
 
+from utils.metrics import metrics
+
 class LLMClient:
     def __init__(self, provider: str = "openai"):
         self.provider = provider
@@ -13,6 +15,7 @@ class LLMClient:
         try:
             if self.provider == "openai":
                 from openai import OpenAI
+                metrics.incr('network_calls')
                 client = OpenAI()
 
                 response = client.chat.completions.create(
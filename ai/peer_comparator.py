@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from utils.rng import derive_rng
 
 class PeerComparator:
     """
@@ -69,16 +70,18 @@ class PeerComparator:
         
         # Add placeholder for peers (in real implementation, would analyze peers too)
         for peer in peers:
+            # RNG per peer: placeholder stabil antar rerun dan aman antar thread
+            rng = derive_rng("peer", peer)
             comparison_data.append({
                 'Ticker': peer,
                 'Sector': self.SECTOR_MAP.get(peer, 'Unknown'),
-                'FinalScore': np.random.randint(3, 8),  # Placeholder
-                'PER': round(np.random.uniform(8, 25), 1),
-                'PBV': round(np.random.uniform(1, 4), 2),
-                'ROE': round(np.random.uniform(0.05, 0.25), 3),
-                'RSI': round(np.random.uniform(30, 70), 1),
-                'DividendYield': round(np.random.uniform(0.01, 0.05), 3),
-                'Label': np.random.choice(['BUY', 'HOLD', 'AVOID'])
+                'FinalScore': int(rng.integers(3, 8)),  # Placeholder
+                'PER': round(rng.uniform(8, 25), 1),
+                'PBV': round(rng.uniform(1, 4), 2),
+                'ROE': round(rng.uniform(0.05, 0.25), 3),
+                'RSI': round(rng.uniform(30, 70), 1),
+                'DividendYield': round(rng.uniform(0.01, 0.05), 3),
+                'Label': str(rng.choice(['BUY', 'HOLD', 'AVOID']))
             })
         
         return pd.DataFrame(comparison_data)
@@ -6,9 +6,53 @@ import warnings
 import yfinance as yf
 from datetime import datetime, timedelta
 import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.cache import cache
+from utils.singleflight import singleflight
+from utils.rate_limiter import market_data_limiter
+from utils.http_pool import session_pool
+from utils.ticker_resolver import ticker_resolver
+from utils.memo import memo, memoize_frame, frame_fingerprint
+from utils.rng import derive_rng
 
 warnings.filterwarnings('ignore')
 
+class QuoteSnapshot:
+    """
+    Harga terkini satu ticker dari satu fetch: harga, sumber, waktu, real-time atau tidak
+    Disimpan di cache sebagai dict (data_type "quote", TTL mengikuti jam bursa)
+    """
+    
+    PRICE_KEYS = ['currentPrice', 'regularMarketPrice', 'previousClose', 'ask', 'bid', 'open']
+    REALTIME_KEYS = ('currentPrice', 'regularMarketPrice')
+    
+    def __init__(self, price: float, source: str, realtime: bool, timestamp: float = None):
+        self.price = price
+        self.source = source
+        self.realtime = realtime
+        self.timestamp = timestamp or time.time()
+    
+    @classmethod
+    def from_info_key(cls, price: float, key: str) -> "QuoteSnapshot":
+        if key in cls.REALTIME_KEYS:
+            return cls(price, f"real-time ({key})", realtime=True)
+        return cls(price, "historical (last close)", realtime=False)
+    
+    @classmethod
+    def from_cache(cls, data):
+        """Snapshot dari entry cache; None jika tidak ada atau formatnya tidak dikenali"""
+        if not isinstance(data, dict) or not data.get('price'):
+            return None
+        return cls(data['price'], data.get('source', 'cache'), data.get('realtime', False), data.get('timestamp'))
+    
+    def to_dict(self) -> dict:
+        return {
+            'price': self.price,
+            'source': self.source,
+            'realtime': self.realtime,
+            'timestamp': self.timestamp,
+        }
+
 class ConservativePricePredictor:
     """
     CONSERVATIVE price prediction based on historical volatility
@@ -27,25 +71,29 @@ class ConservativePricePredictor:
         self.MAX_DAILY_CHANGE = 0.03  # Max 3% daily change (realistic)
         self.VOLATILITY_WINDOW = 20   # Lookback for volatility calculation
         self.CONFIDENCE_DECAY = 0.8   # Confidence decays over prediction horizon
-        
-        # Cache untuk data per ticker
-        self.data_cache = {}
-        self.price_cache = {}
-        self.cache_timeout = 60  # Cache timeout 60 detik
+        self.PRICE_COLUMNS = ['Close', 'High', 'Low']  # Kolom yang dipakai model
+        self.MONTE_CARLO_PATHS = 10000  # Jumlah path simulasi per prediksi
+        self.BATCH_SIMULATION_CELLS = 2_000_000  # Maks sel (ticker x path x hari) per chunk predict_many
+        self.BATCH_COLUMNS = ['Ticker', 'CurrentPrice', 'NextDay', 'AvgPrediction', 'TrendPct', 'Trend',
+                              'Confidence', 'VolatilityPct', 'P5', 'P50', 'P95', 'PriceSource',
+                              'Realtime', 'DataPoints', 'Error']
+        
+        # Prediksi ("prediction") dan harga ("quote") disimpan di DataCache bersama,
+        # TTL mengikuti jam bursa (lihat utils/ttl_policy.py)
     
     # ========== CACHE MANAGEMENT ==========
     
     def clear_cache(self, ticker: str = None):
         """Clear cache untuk ticker tertentu atau semua cache"""
         if ticker:
-            cache_keys = [k for k in self.data_cache.keys() if k.startswith(ticker)]
-            for key in cache_keys:
-                self.data_cache.pop(key, None)
-                self.price_cache.pop(key, None)
+            ticker = ticker.strip().upper()
+            cache.invalidate(ticker, "prediction")
+            cache.invalidate(self._format_ticker_for_yahoo(ticker), "quote")
             print(f"Cache cleared for {ticker}")
         else:
-            self.data_cache = {}
-            self.price_cache = {}
+            cache.invalidate(data_type="prediction")
+            cache.invalidate(data_type="quote")
+            memo.clear("predictor.volatility_model")
             print("All cache cleared")
     
     # ========== MAIN PREDICTION METHOD ==========
@@ -78,15 +126,23 @@ class ConservativePricePredictor:
             # Format ticker untuk Yahoo Finance
             ticker_yf = self._format_ticker_for_yahoo(ticker)
             
+            # Ticker yang baru saja gagal tidak dicoba lagi (negative cache)
+            if ticker_resolver.is_failed(ticker_yf):
+                return self._create_error_response(
+                    f"Ticker {ticker} tidak ditemukan (dicoba ulang nanti). "
+                    f"Pastikan ticker benar (contoh: TLKM.JK, BBCA.JK)",
+                    ticker
+                )
+            
             # Cek cache
             cache_key = f"{ticker}_{days}"
-            if use_cache and cache_key in self.data_cache:
-                cached_data = self.data_cache[cache_key]
-                cache_age = time.time() - cached_data['timestamp']
+            if use_cache:
+                cached_data = cache.get_entry(cache_key, "prediction")
                 
-                if cache_age < self.cache_timeout:
+                if cached_data and not cache.is_expired(cached_data):
+                    cache_age = time.time() - cached_data['timestamp']
                     print(f"⚡ Using cached prediction (age: {cache_age:.1f}s)")
-                    result = cached_data['result'].copy()
+                    result = cached_data['data'].copy()
                     result['cache_used'] = True
                     result['cache_age_seconds'] = cache_age
                     return result
@@ -95,13 +151,16 @@ class ConservativePricePredictor:
             df = self._get_fresh_historical_data(ticker_yf)
             
             if df.empty:
+                ticker_resolver.record_failure(ticker_yf, ticker)
                 return self._create_error_response(
                     f"Tidak dapat mengambil data untuk {ticker}. "
                     f"Pastikan ticker benar (contoh: TLKM.JK, BBCA.JK)"
                 )
+            ticker_resolver.record_success(ticker, ticker_yf)
             
-            # Step 2: Dapatkan harga saat ini
-            current_price = self._get_current_price(ticker_yf, df)
+            # Step 2: Dapatkan harga saat ini (satu snapshot quote per prediksi)
+            quote = self._get_quote(ticker_yf, df)
+            current_price = quote.price
             
             if current_price <= 0:
                 return self._create_error_response(
@@ -110,15 +169,17 @@ class ConservativePricePredictor:
                 )
             
             # Step 3: Generate prediction dengan harga yang sudah didapat
-            result = self.predict_with_volatility_model_and_price(df, current_price, days)
+            result = self.predict_with_volatility_model_and_price(df, current_price, days, ticker=ticker)
             
             # Step 4: Tambahkan metadata
             result.update({
+                'indicators': self._get_streaming_indicators(ticker_yf, df),
                 'ticker': ticker,
                 'data_points': len(df),
                 'latest_data_date': df.index[-1].strftime('%Y-%m-%d') if len(df) > 0 else 'N/A',
-                'price_source': self._get_price_source(ticker_yf, df),
-                'realtime_price_used': self._is_realtime_price_used(ticker_yf, df),
+                'price_source': quote.source,
+                'realtime_price_used': quote.realtime,
+                'price_timestamp': quote.timestamp,
                 'cache_used': False,
                 'processing_time': round(time.time() - start_time, 2),
                 'error': False
@@ -126,10 +187,7 @@ class ConservativePricePredictor:
             
             # Step 5: Cache result jika diaktifkan
             if use_cache:
-                self.data_cache[cache_key] = {
-                    'result': result,
-                    'timestamp': time.time()
-                }
+                cache.set(cache_key, "prediction", result.copy())
                 print(f"💾 Result cached with key: {cache_key}")
             
             print(f"✅ Prediction complete for {ticker}")
@@ -139,6 +197,145 @@ class ConservativePricePredictor:
             print(f"❌ Error in predict_for_ticker: {e}")
             return self._create_error_response(f"Internal error: {str(e)}", ticker)
     
+    def predict_many(self, tickers: list, days: int = 5, max_workers: int = None,
+                     n_paths: int = None) -> pd.DataFrame:
+        """
+        Prediksi banyak ticker dalam satu batch
+        - History dimuat sekaligus lewat DataLoader.load_many (store + download bulk)
+        - Volatilitas, Bollinger dan support/resistance dihitung sebagai panel
+        - Simulasi Monte Carlo semua ticker berjalan bersama (per chunk ticker)
+        - Sisa kerja per ticker (snapshot quote) di thread pool max_workers
+          (default: ukuran session pool HTTP)
+        
+        Seed RNG per ticker sama dengan predict_for_ticker, jadi angka per ticker
+        identik dengan prediksi tunggal untuk data dan harga yang sama.
+        
+        Returns:
+            DataFrame satu baris per ticker (urutan input) dengan kolom Ticker,
+            CurrentPrice, NextDay, AvgPrediction, TrendPct, Trend, Confidence,
+            VolatilityPct, P5, P50, P95 (hari terakhir), PriceSource, Realtime,
+            DataPoints dan Error (None jika berhasil)
+        """
+        from core.data_loader import DataLoader, StoredStock  # Import lokal untuk hindari circular import
+        from core.features import FeatureBlock
+        
+        start_time = time.time()
+        days = max(int(days), 1)
+        n_paths = n_paths or self.MONTE_CARLO_PATHS
+        
+        symbols = {}
+        for ticker in tickers:
+            if isinstance(ticker, str) and ticker.strip():
+                ticker = ticker.strip().upper()
+                symbols.setdefault(ticker, self._format_ticker_for_yahoo(ticker))
+        if not symbols:
+            return pd.DataFrame(columns=self.BATCH_COLUMNS)
+        
+        print(f"🔍 Predicting {len(symbols)} tickers for {days} days...")
+        # Ticker yang baru saja gagal tidak dicoba lagi (negative cache)
+        errors = {ticker: f"Ticker {ticker} tidak ditemukan (dicoba ulang nanti)"
+                  for ticker, symbol in symbols.items() if ticker_resolver.is_failed(symbol)}
+        
+        # Step 1: History semua ticker sekaligus (ticker fallback/dummy dianggap gagal)
+        loaded = DataLoader().load_many([s for t, s in symbols.items() if t not in errors])
+        frames = {}
+        for ticker, symbol in symbols.items():
+            if ticker in errors:
+                continue
+            df, stock = loaded.get(symbol, (None, None))
+            if df is None or df.empty or not isinstance(stock, StoredStock):
+                # Kegagalan sudah dicatat loader; mencatat lagi menghitung satu miss dua kali
+                errors[ticker] = f"Tidak dapat mengambil data untuk {ticker}"
+                continue
+            ticker_resolver.record_success(ticker, symbol)
+            frames[ticker] = df
+        ticker_resolver.flush()
+        
+        # Step 2: Snapshot quote per ticker di thread pool
+        max_workers = max(1, int(max_workers or session_pool.size))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {ticker: executor.submit(self._get_quote, symbols[ticker], df)
+                       for ticker, df in frames.items()}
+        quotes = {}
+        for ticker, future in futures.items():
+            try:
+                quotes[ticker] = future.result()
+            except Exception as e:
+                errors[ticker] = f"Internal error: {str(e)}"
+                continue
+            if quotes[ticker].price <= 0:
+                errors[ticker] = f"Tidak dapat mendapatkan harga untuk {ticker}"
+        
+        # Step 3: Fitur panel + simulasi bersama
+        ready = [t for t in frames if t in quotes and t not in errors]
+        summary = FeatureBlock.panel_summary({t: frames[t] for t in ready})
+        results = {}
+        
+        short = [t for t in ready if summary.at[t, 'bars'] < 10]
+        for ticker in short:
+            results[ticker] = self.predict_with_volatility_model_and_price(
+                frames[ticker], quotes[ticker].price, days, ticker=ticker)
+        
+        batch = [t for t in ready if t not in results]
+        chunk_size = max(1, self.BATCH_SIMULATION_CELLS // (n_paths * days))
+        for start in range(0, len(batch), chunk_size):
+            chunk = batch[start:start + chunk_size]
+            rows = summary.loc[chunk]
+            prices = np.array([quotes[t].price for t in chunk])
+            shocks = np.stack([
+                self._prediction_rng(frames[t], t, quotes[t].price, days, n_paths).normal(
+                    0.0, rows.at[t, 'volatility'], size=(n_paths, days)) * 0.7
+                for t in chunk
+            ])
+            paths = self._simulate_paths(prices, shocks, rows['bb_middle'].to_numpy(),
+                                         rows['sr_high'].to_numpy(), rows['sr_low'].to_numpy())
+            # Persentil per hari di atas sumbu path yang dibuat kontigu (jauh lebih cepat dari axis=1)
+            paths = np.ascontiguousarray(paths.transpose(0, 2, 1))
+            p5, p50, p95 = np.percentile(paths, [5, 50, 95], axis=2)
+            for i, ticker in enumerate(chunk):
+                results[ticker] = self._summarize_paths(
+                    prices[i], rows.at[ticker, 'volatility'], p5[i], p50[i], p95[i], n_paths)
+        
+        # Step 4: Tabel rapi, urutan sesuai input
+        records = []
+        for ticker in symbols:
+            if ticker not in results:
+                records.append(self._batch_record(ticker, error=errors.get(ticker, "Prediksi gagal")))
+                continue
+            records.append(self._batch_record(ticker, results[ticker], quotes[ticker], len(frames[ticker])))
+        
+        print(f"✅ Batch prediction complete: {len(results)}/{len(symbols)} tickers "
+              f"in {time.time() - start_time:.2f}s")
+        return pd.DataFrame.from_records(records, columns=self.BATCH_COLUMNS)
+    
+    def _batch_record(self, ticker: str, result: dict = None, quote: "QuoteSnapshot" = None,
+                      data_points: int = 0, error: str = None) -> dict:
+        """Satu baris DataFrame predict_many"""
+        if result is None:
+            record = dict.fromkeys(self.BATCH_COLUMNS)
+            record.update({'Ticker': ticker, 'DataPoints': data_points, 'Error': error})
+            return record
+        
+        # realistic_range = band P5/P50/P95 hari terakhir
+        realistic_range = result['realistic_range']
+        return {
+            'Ticker': ticker,
+            'CurrentPrice': result['current_price'],
+            'NextDay': result['next_day_prediction'],
+            'AvgPrediction': result['avg_prediction'],
+            'TrendPct': result['trend_percentage'],
+            'Trend': result['trend'],
+            'Confidence': result['confidence'],
+            'VolatilityPct': result['volatility_pct'],
+            'P5': realistic_range['pessimistic'],
+            'P50': realistic_range['most_likely'],
+            'P95': realistic_range['optimistic'],
+            'PriceSource': quote.source,
+            'Realtime': quote.realtime,
+            'DataPoints': data_points,
+            'Error': None,
+        }
+    
     def _create_error_response(self, message: str, ticker: str = "") -> dict:
         """Create standardized error response"""
         return {
@@ -169,35 +366,35 @@ class ConservativePricePredictor:
     # ========== HELPER METHODS ==========
     
     def _format_ticker_for_yahoo(self, ticker: str) -> str:
-        """Format ticker untuk Yahoo Finance"""
-        ticker = ticker.strip().upper()
-        
-        # Jika ticker tidak mengandung .JK, tambahkan
-        if not ticker.endswith('.JK'):
-            return f"{ticker}.JK"
-        
-        return ticker
+        """Format ticker untuk Yahoo Finance (resolusi dibagi dengan DataLoader)"""
+        return ticker_resolver.primary(ticker)
     
     def _get_fresh_historical_data(self, ticker: str) -> pd.DataFrame:
         """Get fresh historical data from Yahoo Finance"""
+        # Pemanggil bersamaan untuk ticker yang sama berbagi satu fetch
+        return singleflight.do(("predictor_history", ticker), self._fetch_historical_data, ticker)
+    
+    def _fetch_historical_data(self, ticker: str) -> pd.DataFrame:
         try:
-            print(f"📥 Fetching data for {ticker}...")
-            stock = yf.Ticker(ticker)
+            # Cek price store lokal dulu (hanya kolom yang dibutuhkan)
+            from core.data_loader import DataLoader  # Import lokal untuk hindari circular import
+            df = DataLoader().load_columns(ticker, columns=self.PRICE_COLUMNS)
+            if df is not None and len(df) >= 5:
+                print(f"⚡ Using stored data for {ticker}: {len(df)} data points")
+                return df
             
-            # Coba beberapa period untuk memastikan dapat data
-            periods = ["3mo", "1mo", "6mo", "1y"]
+            print(f"📥 Fetching data for {ticker}...")
+            stock = yf.Ticker(ticker, session=session_pool.get())
             
-            for period in periods:
+            # 3mo cukup untuk hampir semua ticker; 1y hanya untuk ticker yang jarang
+            # diperdagangkan (1mo dan date range 90 hari sudah tercakup oleh 3mo)
+            for period in ["3mo", "1y"]:
+                market_data_limiter.acquire()
                 df = stock.history(period=period)
                 if not df.empty and len(df) >= 5:
                     print(f"✅ Got {len(df)} data points for {ticker}")
                     return df
             
-            # Jika semua period gagal, coba dengan date range
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=90)
-            df = stock.history(start=start_date, end=end_date)
-            
             if df.empty:
                 print(f"❌ No data found for {ticker}")
                 return pd.DataFrame()
@@ -208,133 +405,143 @@ class ConservativePricePredictor:
             print(f"❌ Error fetching data for {ticker}: {e}")
             return pd.DataFrame()
     
-    def _get_current_price(self, ticker: str, df: pd.DataFrame) -> float:
-        """Get current price from multiple sources"""
+    def _get_quote(self, ticker: str, df: pd.DataFrame) -> "QuoteSnapshot":
+        """
+        Snapshot harga ticker: satu fetch per prediksi, disimpan di cache "quote"
+        dan dipakai bersama oleh _get_current_price, _get_price_source dan
+        _is_realtime_price_used
+        """
+        cached = QuoteSnapshot.from_cache(cache.get(ticker, "quote"))
+        if cached:
+            print(f"📊 Using cached price for {ticker}: {cached.price}")
+            return cached
+        
+        # Pemanggil bersamaan untuk ticker yang sama berbagi satu fetch
+        return singleflight.do(("quote", ticker), self._fetch_quote, ticker, df)
+    
+    def _fetch_quote(self, ticker: str, df: pd.DataFrame) -> "QuoteSnapshot":
         try:
-            # Cek cache harga dulu
-            if ticker in self.price_cache:
-                cached_time, cached_price = self.price_cache[ticker]
-                if time.time() - cached_time < 30:  # Cache 30 detik untuk harga
-                    print(f"📊 Using cached price for {ticker}: {cached_price}")
-                    return cached_price
-            
-            stock = yf.Ticker(ticker)
+            stock = yf.Ticker(ticker, session=session_pool.get())
             
-            # Method 1: Try to get real-time price
+            # Method 1: Try to get real-time price (satu panggilan info)
             try:
+                market_data_limiter.acquire()
                 info = stock.info
-                price_keys = ['currentPrice', 'regularMarketPrice', 'previousClose', 
-                            'ask', 'bid', 'open']
                 
-                for key in price_keys:
+                for key in QuoteSnapshot.PRICE_KEYS:
                     price = info.get(key)
                     if price and not np.isnan(price):
                         print(f"✅ Got real-time price for {ticker}: {price} (from {key})")
-                        # Cache the price
-                        self.price_cache[ticker] = (time.time(), float(price))
-                        return float(price)
+                        quote = QuoteSnapshot.from_info_key(float(price), key)
+                        cache.set(ticker, "quote", quote.to_dict())
+                        return quote
             except:
                 pass
             
             # Method 2: Try to get latest from 1-day history
             try:
+                market_data_limiter.acquire()
                 hist = stock.history(period="1d")
                 if not hist.empty:
-                    price = hist['Close'].iloc[-1]
+                    price = float(hist['Close'].iloc[-1])
                     print(f"✅ Got 1-day price for {ticker}: {price}")
-                    self.price_cache[ticker] = (time.time(), float(price))
-                    return float(price)
+                    quote = QuoteSnapshot(price, "historical (1-day history)", realtime=False)
+                    cache.set(ticker, "quote", quote.to_dict())
+                    return quote
             except:
                 pass
-            
-            # Method 3: Use last close from the dataframe
-            if len(df) > 0:
-                price = df['Close'].iloc[-1]
-                print(f"⚠️ Using last close price for {ticker}: {price}")
-                return float(price)
-            
-            print(f"❌ Could not get price for {ticker}")
-            return 0.0
-            
         except Exception as e:
             print(f"❌ Error getting price for {ticker}: {e}")
-            if len(df) > 0:
-                return float(df['Close'].iloc[-1])
-            return 0.0
+        
+        # Method 3: Use last close from the dataframe (tidak di-cache)
+        if len(df) > 0:
+            price = float(df['Close'].iloc[-1])
+            print(f"⚠️ Using last close price for {ticker}: {price}")
+            return QuoteSnapshot(price, "historical (last close)", realtime=False)
+        
+        print(f"❌ Could not get price for {ticker}")
+        return QuoteSnapshot(0.0, "unavailable", realtime=False)
+    
+    def _get_current_price(self, ticker: str, df: pd.DataFrame) -> float:
+        """Get current price from multiple sources"""
+        return self._get_quote(ticker, df).price
     
     def _get_price_source(self, ticker: str, df: pd.DataFrame) -> str:
         """Determine the source of the price"""
-        try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            
-            if info.get('currentPrice') and not np.isnan(info.get('currentPrice')):
-                return "real-time (currentPrice)"
-            elif info.get('regularMarketPrice') and not np.isnan(info.get('regularMarketPrice')):
-                return "real-time (regularMarketPrice)"
-            else:
-                return "historical (last close)"
-        except:
-            return "historical (last close)"
+        return self._get_quote(ticker, df).source
     
     def _is_realtime_price_used(self, ticker: str, df: pd.DataFrame) -> bool:
         """Check if real-time price was used"""
+        return self._get_quote(ticker, df).realtime
+    
+    # ========== PREDICTION ENGINE ==========
+    
+    def _get_streaming_indicators(self, ticker: str, df: pd.DataFrame) -> dict:
+        """RSI/MACD dari state indikator tersimpan, hanya bar baru yang diproses"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            from core.technical import TechnicalEngine  # Import lokal untuk hindari circular import
             
-            if (info.get('currentPrice') and not np.isnan(info.get('currentPrice'))) or \
-               (info.get('regularMarketPrice') and not np.isnan(info.get('regularMarketPrice'))):
-                return True
-            return False
-        except:
-            return False
+            tech = TechnicalEngine().calculate_streaming(ticker, df)
+            return {'rsi': tech['RSI'], 'macd': tech['MACD'], 'score': tech['TechnicalRating']['Raw']}
+        except Exception as e:
+            print(f"Streaming indicators failed for {ticker}: {str(e)[:100]}")
+            return None
     
-    # ========== PREDICTION ENGINE ==========
+    def _get_features(self, df: pd.DataFrame, features=None):
+        """FeatureBlock bersama (dihitung sekali per DataFrame jika belum diberikan)"""
+        if features is not None:
+            return features
+        from core.features import FeatureBlock  # Import lokal untuk hindari circular import
+        return FeatureBlock.from_frame(df)
     
-    def predict_with_volatility_model_and_price(self, df: pd.DataFrame, current_price: float, days: int = 5) -> dict:
+    @memoize_frame("predictor.volatility_model",
+                   params=lambda self: (self.MAX_DAILY_CHANGE, self.CONFIDENCE_DECAY))
+    def predict_with_volatility_model_and_price(self, df: pd.DataFrame, current_price: float, days: int = 5,
+                                                features=None, n_paths: int = None, ticker: str = None) -> dict:
         """
         Modified version of predict_with_volatility_model that accepts current_price parameter
+        
+        Harga disimulasikan sebagai n_paths path Monte Carlo (default MONTE_CARLO_PATHS);
+        prediksi harian adalah median (P50) per hari dan realistic_range diambil
+        dari band P5/P95 hari terakhir.
+        
+        features: FeatureBlock dari df (opsional) agar volatilitas, Bollinger dan
+        support/resistance tidak dihitung ulang
+        ticker: Dipakai untuk menurunkan seed RNG; input yang sama selalu
+        menghasilkan prediksi yang sama (di thread atau proses mana pun)
         """
         if len(df) < 10:
             return self._get_ultra_conservative_prediction_with_price(df, current_price)
         
-        volatility = self.calculate_historical_volatility(df)
+        features = self._get_features(df, features)
+        volatility = features.volatility()
         
         # Calculate Bollinger Bands
-        bb = self.calculate_bollinger_bands(df)
+        bb = features.bollinger()
         
         # Get support/resistance
-        sr_levels = self.get_support_resistance_levels(df)
+        sr_levels = features.support_resistance()
         
-        # Generate predictions with mean reversion
-        predictions = []
-        last_price = current_price
+        # Generate predictions with mean reversion (semua path sekaligus)
+        days = max(int(days), 1)
+        n_paths = n_paths or self.MONTE_CARLO_PATHS
+        rng = self._prediction_rng(df, ticker, current_price, days, n_paths)
+        paths = self.simulate_price_paths(current_price, volatility, days, bb, sr_levels, n_paths, rng)
+        p5, p50, p95 = np.percentile(paths, [5, 50, 95], axis=0)
         
-        for day in range(days):
-            # Mean reversion factor (prices tend to revert to mean)
-            mean_reversion_factor = 0
-            if bb and bb.get('middle'):
-                mean_reversion_factor = 0.3 * (bb['middle'] - last_price) / bb['middle']
-            
-            # Random component based on historical volatility
-            random_component = np.random.normal(0, volatility) * 0.7
-            
-            # Combined daily change (capped)
-            daily_change = mean_reversion_factor + random_component
-            daily_change = max(-self.MAX_DAILY_CHANGE, min(self.MAX_DAILY_CHANGE, daily_change))
-            
-            next_price = last_price * (1 + daily_change)
-            
-            # Apply support/resistance boundaries
-            if sr_levels.get('recent_high') and next_price > sr_levels['recent_high'] * 1.02:
-                next_price = sr_levels['recent_high'] * 0.98
-            
-            if sr_levels.get('recent_low') and next_price < sr_levels['recent_low'] * 0.98:
-                next_price = sr_levels['recent_low'] * 1.02
-            
-            predictions.append(next_price)
-            last_price = next_price
+        result = self._summarize_paths(current_price, volatility, p5, p50, p95, len(paths))
+        result.update({
+            'bollinger_bands': bb,
+            'support_resistance': sr_levels,
+            'disclaimer': "Prediksi didasarkan pada volatilitas historis. Pergerakan aktual bisa berbeda. Gunakan hanya sebagai referensi tambahan."
+        })
+        return result
+    
+    def _summarize_paths(self, current_price: float, volatility: float, p5: np.ndarray,
+                         p50: np.ndarray, p95: np.ndarray, n_paths: int) -> dict:
+        """Trend, confidence dan range dari band persentil harian hasil simulasi"""
+        predictions = list(p50)
+        days = len(predictions)
         
         # Calculate trend
         avg_prediction = np.mean(predictions)
@@ -360,10 +567,9 @@ class ConservativePricePredictor:
         # Confidence decays with prediction horizon
         confidence = max(30, 70 * (self.CONFIDENCE_DECAY ** (days-1)))
         
-        # Calculate realistic range based on volatility
-        volatility_multiplier = min(days * 0.015, 0.05)
-        optimistic = current_price * (1 + volatility_multiplier)
-        pessimistic = current_price * (1 - volatility_multiplier)
+        # Realistic range dari distribusi simulasi di akhir horizon
+        optimistic = p95[-1]
+        pessimistic = p5[-1]
         
         # Calculate potential change for next day
         potential_change_pct = ((predictions[0] - current_price) / current_price * 100) if predictions else 0
@@ -378,17 +584,93 @@ class ConservativePricePredictor:
             'confidence': round(float(confidence), 1),
             'potential_change_pct': round(float(potential_change_pct), 2),
             'avg_prediction': round(float(avg_prediction), 2),
-            'volatility_pct': round(volatility * 100, 2),
-            'bollinger_bands': bb,
-            'support_resistance': sr_levels,
+            'volatility_pct': round(float(volatility) * 100, 2),
             'realistic_range': {
                 'optimistic': round(float(optimistic), 2),
                 'pessimistic': round(float(pessimistic), 2),
-                'most_likely': round(np.median(predictions), 2) if predictions else round(float(current_price), 2)
+                'most_likely': round(float(p50[-1]), 2)
+            },
+            'prediction_bands': {
+                'p5': [round(float(p), 2) for p in p5],
+                'p50': [round(float(p), 2) for p in p50],
+                'p95': [round(float(p), 2) for p in p95],
+                'paths': n_paths
             },
-            'disclaimer': "Prediksi didasarkan pada volatilitas historis. Pergerakan aktual bisa berbeda. Gunakan hanya sebagai referensi tambahan."
         }
     
+    def _prediction_rng(self, df: pd.DataFrame, ticker: str, current_price: float, days: int, n_paths: int):
+        """Stream RNG per prediksi dari (ticker, bar terakhir, parameter), bukan state global np.random"""
+        last_bar = None
+        if len(df) > 0:
+            last_bar = df.index[-1]
+            last_bar = last_bar.strftime('%Y-%m-%d') if hasattr(last_bar, 'strftime') else str(last_bar)
+        source = ticker.strip().upper() if ticker else frame_fingerprint(df)
+        return derive_rng("prediction", source, last_bar, round(float(current_price), 4),
+                          days, n_paths, self.MAX_DAILY_CHANGE, self.CONFIDENCE_DECAY)
+    
+    def simulate_price_paths(self, current_price: float, volatility: float, days: int,
+                             bb: dict = None, sr_levels: dict = None, n_paths: int = None,
+                             rng: np.random.Generator = None) -> np.ndarray:
+        """
+        Simulasi Monte Carlo harga dengan mean reversion, vectorized atas semua path
+        
+        Per hari (loop hanya sepanjang horizon, bukan per path):
+        - Mean reversion 30% menuju middle Bollinger + shock normal(0, volatility) * 0.7
+        - Perubahan harian dibatasi ±MAX_DAILY_CHANGE
+        - Harga yang menembus support/resistance 2% dipantulkan ke dalam range
+        
+        Returns:
+            np.ndarray (n_paths x days)
+        """
+        n_paths = n_paths or self.MONTE_CARLO_PATHS
+        rng = rng or derive_rng("paths", float(current_price), float(volatility), days, n_paths)
+        
+        middle = bb.get('middle') if bb else None
+        recent_high = (sr_levels or {}).get('recent_high')
+        recent_low = (sr_levels or {}).get('recent_low')
+        
+        shocks = rng.normal(0.0, volatility, size=(n_paths, days)) * 0.7
+        paths = self._simulate_paths([current_price], shocks[np.newaxis],
+                                     [middle or np.nan], [recent_high or np.nan], [recent_low or np.nan])
+        return paths[0]
+    
+    def _simulate_paths(self, current_price, shocks: np.ndarray, middle, recent_high, recent_low) -> np.ndarray:
+        """
+        Inti simulasi untuk banyak ticker sekaligus
+        
+        Args:
+            current_price, middle, recent_high, recent_low: Nilai per ticker
+                (NaN berarti level tidak tersedia dan aturannya dilewati)
+            shocks: Shock harian (ticker x path x hari), sudah dikali 0.7
+        
+        Returns:
+            np.ndarray (ticker x path x hari)
+        """
+        n_paths = shocks.shape[1]
+        middle = np.asarray(middle, dtype=float).reshape(-1, 1)
+        recent_high = np.asarray(recent_high, dtype=float).reshape(-1, 1)
+        recent_low = np.asarray(recent_low, dtype=float).reshape(-1, 1)
+        has_middle = np.isfinite(middle) & (middle != 0)
+        middle = np.where(has_middle, middle, 1.0)
+        
+        paths = np.empty_like(shocks)
+        last_price = np.repeat(np.asarray(current_price, dtype=float).reshape(-1, 1), n_paths, axis=1)
+        
+        for day in range(shocks.shape[2]):
+            daily_change = shocks[:, :, day] + np.where(has_middle, 0.3 * (middle - last_price) / middle, 0.0)
+            np.clip(daily_change, -self.MAX_DAILY_CHANGE, self.MAX_DAILY_CHANGE, out=daily_change)
+            
+            next_price = last_price * (1 + daily_change)
+            
+            # Apply support/resistance boundaries (perbandingan dengan NaN selalu False)
+            next_price = np.where(next_price > recent_high * 1.02, recent_high * 0.98, next_price)
+            next_price = np.where(next_price < recent_low * 0.98, recent_low * 1.02, next_price)
+            
+            paths[:, :, day] = next_price
+            last_price = next_price
+        
+        return paths
+    
     def _get_ultra_conservative_prediction_with_price(self, df: pd.DataFrame, current_price: float) -> dict:
         """Ultra conservative prediction when data is limited with custom price"""
         # Simple mean reversion prediction
@@ -441,26 +723,19 @@ class ConservativePricePredictor:
     
     # ========== ORIGINAL METHODS (KEPT FOR BACKWARD COMPATIBILITY) ==========
     
-    def calculate_historical_volatility(self, df):
+    def calculate_historical_volatility(self, df, features=None):
         """Calculate realistic historical volatility"""
-        if len(df) < 10:
-            return 0.015  # Default 1.5% volatility
-        
-        returns = df['Close'].pct_change().dropna()
-        if len(returns) < 5:
-            return 0.015
-        
-        # Use rolling standard deviation
-        volatility = returns.rolling(window=min(10, len(returns))).std().iloc[-1]
-        
-        # Cap volatility at reasonable levels
-        return min(max(volatility, 0.005), 0.05)
+        # Default 1.5% volatility jika data kurang, dibatasi 0.5%-5%
+        return self._get_features(df, features).volatility()
     
-    def calculate_bollinger_bands(self, df, window=20):
+    def calculate_bollinger_bands(self, df, window=20, features=None):
         """Calculate Bollinger Bands for realistic price ranges"""
         if len(df) < window:
             return None
         
+        if window == 20:
+            return self._get_features(df, features).bollinger()
+        
         rolling_mean = df['Close'].rolling(window=window).mean()
         rolling_std = df['Close'].rolling(window=window).std()
         
@@ -474,31 +749,11 @@ class ConservativePricePredictor:
             'width_pct': float((upper_band.iloc[-1] - lower_band.iloc[-1]) / rolling_mean.iloc[-1] * 100)
         }
     
-    def get_support_resistance_levels(self, df):
+    def get_support_resistance_levels(self, df, features=None):
         """Identify key support and resistance levels"""
-        if len(df) < 20:
-            return {'current': df['Close'].iloc[-1] if len(df) > 0 else 0}
-        
-        recent_high = df['High'].tail(20).max()
-        recent_low = df['Low'].tail(20).min()
-        current = df['Close'].iloc[-1]
-        
-        def find_psychological_levels(price):
-            levels = []
-            base = round(price / 100) * 100
-            levels.extend([base - 200, base - 100, base, base + 100, base + 200])
-            return [l for l in levels if l > 0]
-        
-        psych_levels = find_psychological_levels(current)
-        
-        return {
-            'recent_high': float(recent_high),
-            'recent_low': float(recent_low),
-            'current': float(current),
-            'psychological_levels': psych_levels[:3]
-        }
+        return self._get_features(df, features).support_resistance()
     
-    def predict_with_volatility_model(self, df, days=5):
+    def predict_with_volatility_model(self, df, days=5, features=None, ticker=None):
         """
         Original method - kept for backward compatibility
         Uses last price from dataframe
@@ -507,7 +762,7 @@ class ConservativePricePredictor:
             return self._get_ultra_conservative_prediction_with_price(df, 0)
         
         current_price = df['Close'].iloc[-1]
-        return self.predict_with_volatility_model_and_price(df, current_price, days)
+        return self.predict_with_volatility_model_and_price(df, current_price, days, features=features, ticker=ticker)
     
     def _get_ultra_conservative_prediction(self, df):
         """Original ultra conservative prediction method"""
@@ -518,13 +773,13 @@ class ConservativePricePredictor:
         
         return self._get_ultra_conservative_prediction_with_price(df, current_price)
     
-    def generate_trading_scenarios(self, df):
+    def generate_trading_scenarios(self, df, features=None):
         """Generate realistic trading scenarios instead of precise predictions"""
         if len(df) < 20:
             return self._get_basic_scenarios(df)
         
         current_price = df['Close'].iloc[-1]
-        volatility = self.calculate_historical_volatility(df)
+        volatility = self.calculate_historical_volatility(df, features)
         
         scenarios = {
             'bullish_scenario': {
@@ -21,6 +21,12 @@ for folder in folders:
     if os.path.exists(folder_path) and folder_path not in sys.path:
         sys.path.insert(0, folder_path)
 
+from utils.ttl_policy import MarketHoursTTLPolicy
+from utils.metrics import metrics
+
+# Endpoint teks /metrics jika WARREN_METRICS_PORT diset (sekali per proses)
+metrics.serve_from_env()
+
 st.set_page_config(
     page_title="WarrenAI - Stock Analysis & Prediction",
     page_icon="📈",
@@ -262,7 +268,7 @@ def safe_get(result, key, default):
     except:
         return default
 
-def create_price_chart(predictions, current_price, ticker):
+def create_price_chart(predictions, current_price, ticker, bands=None):
     """Create interactive price prediction chart"""
     try:
         days = list(range(len(predictions) + 1))
@@ -299,7 +305,22 @@ def create_price_chart(predictions, current_price, ticker):
         ))
         
         # Add confidence interval (shaded area)
-        if len(predictions) > 0:
+        if bands and len(bands.get('p5', [])) == len(predictions):
+            # Band P5-P95 dari simulasi Monte Carlo
+            upper_bound = [current_price] + list(bands['p95'])
+            lower_bound = [current_price] + list(bands['p5'])
+            
+            fig.add_trace(go.Scatter(
+                x=days + days[::-1],
+                y=upper_bound + lower_bound[::-1],
+                fill='toself',
+                fillcolor='rgba(59, 130, 246, 0.15)',
+                line=dict(color='rgba(255,255,255,0)'),
+                name=f"Monte Carlo P5-P95 ({bands.get('paths', 0):,} path)",
+                showlegend=True,
+                hoverinfo='skip'
+            ))
+        elif len(predictions) > 0:
             volatility = np.std(predictions) / current_price if current_price > 0 else 0.02
             upper_bound = [current_price * (1 + volatility * i * 0.8) for i in range(len(prices))]
             lower_bound = [current_price * (1 - volatility * i * 0.8) for i in range(len(prices))]
@@ -576,7 +597,8 @@ def display_prediction_results(result, ticker):
         st.subheader("📈 Visualisasi Prediksi")
         
         if current_price > 0 and len(predictions) > 0:
-            fig = create_price_chart(predictions, current_price, ticker)
+            fig = create_price_chart(predictions, current_price, ticker,
+                                     safe_get(result, 'prediction_bands', None))
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
         else:
@@ -697,6 +719,15 @@ def display_prediction_results(result, ticker):
                         st.markdown(f"- {format_currency(level)} ({format_percentage(diff_pct)})")
             else:
                 st.info("Support & Resistance tidak tersedia untuk analisis ini")
+        
+        indicators = safe_get(result, 'indicators', None)
+        if indicators:
+            st.markdown("##### 📈 Momentum")
+            col_a, col_b = st.columns(2)
+            with col_a:
+                st.metric("RSI (14)", f"{indicators.get('rsi', 50):.1f}")
+            with col_b:
+                st.metric("MACD Histogram", f"{indicators.get('macd', 0):.4f}")
     
     with tab4:
         # Information tab
@@ -795,8 +826,7 @@ def price_prediction_panel():
             ticker = f"{ticker}.JK"
         
         # Market status
-        current_hour = datetime.now().hour
-        market_open = 9 <= current_hour < 16
+        market_open = MarketHoursTTLPolicy().is_market_open()
         market_status = "🟢 BURSA BUKA" if market_open else "🔴 BURSA TUTUP"
         
         st.markdown(f"**Status Pasar:** {market_status}")
@@ -825,6 +855,10 @@ def price_prediction_panel():
                     st.session_state.last_ticker = None  # Force refresh
                     st.rerun()
         
+        # Semua blue chip dalam satu batch prediksi
+        if st.button("📊 PREDIKSI SEMUA BLUE CHIP", use_container_width=True, key="btn_blue_chips"):
+            st.session_state.batch_tickers = list(blue_chips.values())
+        
         # Prediction parameters
         st.markdown("---")
         st.markdown("**🔮 SETTING PREDIKSI:**")
@@ -879,8 +913,8 @@ def price_prediction_panel():
     # Initialize predictor jika belum ada
     if st.session_state.predictor is None:
         try:
-            from ai.price_predictor import ConservativePricePredictor
-            st.session_state.predictor = ConservativePricePredictor()
+            from core.context import get_context
+            st.session_state.predictor = get_context().predictor  # Instance bersama dengan screener
             if st.session_state.debug_mode:
                 st.success("✅ Predictor initialized successfully!")
         except Exception as e:
@@ -910,6 +944,20 @@ def price_prediction_panel():
         time.sleep(60)
         st.rerun()
     
+    # Batch prediksi blue chip (satu load bulk + simulasi bersama)
+    batch_tickers = st.session_state.get('batch_tickers')
+    if batch_tickers:
+        with st.spinner(f"🔍 Menganalisis {len(batch_tickers)} saham..."):
+            batch = st.session_state.predictor.predict_many(batch_tickers, days=prediction_days)
+        
+        st.markdown("### 📊 Prediksi Blue Chip")
+        from ui.screener_panel import display_batch_predictions
+        display_batch_predictions(batch)
+        
+        if st.button("Tutup Tabel", type="secondary", key="close_batch"):
+            st.session_state.batch_tickers = None
+            st.rerun()
+    
     # Prediction button
     st.markdown("---")
     
@@ -1079,8 +1127,12 @@ def main():
                 st.title("📋 Portfolio Management")
                 st.info("Fitur Portfolio Management akan segera hadir!")
         else:  # Settings
-            st.title("⚙️ Settings")
-            st.info("Pengaturan aplikasi akan segera hadir!")
+            try:
+                from ui.settings_panel import settings_panel
+                settings_panel()
+            except Exception as e:
+                st.title("⚙️ Settings")
+                st.error(f"Settings tidak dapat dimuat: {str(e)[:100]}")
             
     except Exception as e:
         st.error(f"❌ Application Error: {str(e)}")
@@ -0,0 +1,85 @@
+"""
+Benchmark: ParallelScreener mode thread vs process pada universe 900 ticker
+
+Data sintetis ditulis ke price store sementara (tanpa network), jadi yang
+diukur hanya scoring CPU-bound dari data yang sudah tersimpan.
+
+Jalankan dari root project:
+    python benchmarks/bench_screener.py [jumlah_ticker]
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def synthetic_history(rng, bars=120):
+    """OHLCV random walk harian"""
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=bars)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.015, bars)))
+    spread = close * rng.uniform(0.002, 0.02, bars)
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 1, bars) * spread / 2,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(100_000, 10_000_000, bars).astype(float),
+    }, index=index)
+
+def seed_store(tickers):
+    """Tulis history + info fundamental sintetis ke price store dan tandai di cache"""
+    from utils.cache import cache
+    from core.price_store import price_store
+    
+    rng = np.random.default_rng(7)
+    for ticker in tickers:
+        df = synthetic_history(rng)
+        price_store.write(ticker, df, symbol=ticker)
+        price_store.write_info(ticker, {
+            'symbol': ticker,
+            'shortName': ticker,
+            'trailingPE': float(rng.uniform(5, 30)),
+            'priceToBook': float(rng.uniform(0.5, 5)),
+            'returnOnEquity': float(rng.uniform(-0.05, 0.3)),
+            'dividendYield': float(rng.uniform(0, 0.08)),
+        })
+        cache.set(ticker, "history", {'symbol': ticker, 'rows': len(df), 'last_date': str(df.index[-1])},
+                  files=price_store.files(ticker))
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def main():
+    n_tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 900
+    
+    # Cache dan price store relatif ke cwd; worker spawn mewarisi cwd ini
+    workdir = tempfile.mkdtemp(prefix="bench_screener_")
+    os.chdir(workdir)
+    
+    from screener.engine import ScreenerEngine
+    from screener.parallel_engine import ParallelScreener
+    
+    tickers = [f"T{i:04d}.JK" for i in range(n_tickers)]
+    _, seed_time = timed(lambda: seed_store(tickers))
+    print(f"Universe: {n_tickers} ticker sintetis (seed {seed_time:.1f}s) di {workdir}")
+    print(f"CPU: {os.cpu_count()}")
+    
+    sections = ScreenerEngine.BASIC_SECTIONS
+    thread_df, thread_time = timed(lambda: ParallelScreener(mode="thread").run(tickers, sections=sections))
+    process_df, process_time = timed(lambda: ParallelScreener(mode="process").run(tickers, sections=sections))
+    
+    same_order = list(thread_df['Ticker']) == list(process_df['Ticker']) == tickers
+    same_scores = np.allclose(thread_df['FinalScore'], process_df['FinalScore'])
+    
+    print(f"  Threads:   {thread_time:8.2f} s  ({n_tickers / thread_time:7.1f} ticker/s)")
+    print(f"  Processes: {process_time:8.2f} s  ({n_tickers / process_time:7.1f} ticker/s)")
+    print(f"  Speedup:   {thread_time / process_time:8.2f}x")
+    print(f"  Urutan sama: {same_order}, skor sama: {same_scores}")
+
+if __name__ == "__main__":
+    main()
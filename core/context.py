@@ -0,0 +1,92 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.data_loader import DataLoader
+from core.fundamental import FundamentalEngine
+from core.technical import TechnicalEngine
+from core.dividend import DividendEngine
+from core.scoring import ScoringEngine
+
+from ai.hybrid_explainer import HybridAIExplainer
+from ai.confidence import ConfidenceEngine
+from ai.risk import RiskDisclosureEngine
+from ai.scenario import ScenarioEngine
+from ai.stress import StressTestEngine
+from ai.compliance import ComplianceEngine
+from ai.price_predictor import ConservativePricePredictor
+from ai.news_analyzer import NewsSentimentAnalyzer
+from ai.peer_comparator import PeerComparator
+
+class AnalysisContext:
+    """
+    Registry engine analisis yang dibangun sekali per proses
+    - Semua engine stateless per panggilan (state bersama ada di cache/store
+      yang sudah thread-safe), jadi satu instance aman dipakai banyak thread
+    - StockAnalyzer per ticker hanya mengambil referensi engine dari sini,
+      tidak membuat ulang predictor, LLM client, news analyzer, dst.
+    - DataLoader disimpan per period karena period adalah konfigurasi loader
+    - stage_executor: thread pool bersama untuk stage I/O StockAnalyzer yang
+      berjalan bersamaan (prediksi, berita, peer, LLM)
+    """
+    
+    # Nama atribut engine, sama dengan atribut StockAnalyzer
+    ENGINES = ('fund', 'tech', 'div', 'score_engine',
+               'ai', 'confidence', 'risk_engine', 'scenario', 'stress', 'compliance',
+               'predictor', 'news_analyzer', 'peer_comparator')
+    
+    def __init__(self):
+        # Core engines
+        self.fund = FundamentalEngine()
+        self.tech = TechnicalEngine()
+        self.div = DividendEngine()
+        self.score_engine = ScoringEngine()
+        
+        # AI engines
+        self.ai = HybridAIExplainer()
+        self.confidence = ConfidenceEngine()
+        self.risk_engine = RiskDisclosureEngine()
+        self.scenario = ScenarioEngine()
+        self.stress = StressTestEngine()
+        self.compliance = ComplianceEngine()
+        
+        # AI Enhancement Engines
+        self.predictor = ConservativePricePredictor()
+        self.news_analyzer = NewsSentimentAnalyzer()
+        self.peer_comparator = PeerComparator()
+        
+        # Pool proses, bukan per analisis: stage yang timeout tidak menahan pemanggil
+        self.stage_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("WARREN_STAGE_WORKERS", "16")),
+            thread_name_prefix="analysis-stage"
+        )
+        
+        self._loaders = {}
+        self._lock = threading.Lock()
+    
+    def loader(self, period: str = "3mo") -> DataLoader:
+        """DataLoader bersama untuk satu period"""
+        with self._lock:
+            if period not in self._loaders:
+                self._loaders[period] = DataLoader(period)
+            return self._loaders[period]
+
+_context = None
+_context_lock = threading.Lock()
+
+def get_context() -> AnalysisContext:
+    """AnalysisContext proses ini (dibuat saat pertama kali dibutuhkan)"""
+    global _context
+    if _context is None:
+        with _context_lock:
+            if _context is None:
+                _context = AnalysisContext()
+    return _context
+
+def reset_context():
+    """Buang context lama (misal setelah konfigurasi berubah); engine baru dibuat saat dibutuhkan"""
+    global _context
+    with _context_lock:
+        if _context is not None:
+            _context.stage_executor.shutdown(wait=False)
+        _context = None
@@ -1,88 +1,106 @@
 import yfinance as yf
 import pandas as pd
-import requests
+import numpy as np
+import math
 import time
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from utils.cache import cache
+from core.price_store import price_store
+from utils.singleflight import singleflight
+from utils.rate_limiter import market_data_limiter
+from utils.http_pool import session_pool
+from utils.ticker_resolver import ticker_resolver
+from utils.rng import derive_rng, ticker_checksum
+
+class StoredStock:
+    """Pengganti ringan yf.Ticker: symbol + info fundamental dari price store"""
+    
+    def __init__(self, ticker: str, symbol: str, loader, info: dict = None):
+        self.ticker = symbol
+        self._key = ticker
+        self._loader = loader
+        self._info = info
+    
+    @property
+    def info(self):
+        # Info baru diambil saat pertama kali dibutuhkan
+        if self._info is None:
+            self._info = self._loader._load_info(self._key, self.ticker)
+        return self._info
 
 class DataLoader:
-    def __init__(self, period: str = "3mo"):  # Kurangi period untuk mengurangi load
+    BATCH_SIZE = 50  # Jumlah ticker per request bulk download
+    
+    # Panjang period dalam hari, untuk memangkas history hasil refresh incremental
+    PERIOD_DAYS = {
+        "1mo": 31, "3mo": 92, "6mo": 183,
+        "1y": 366, "2y": 731, "5y": 1827, "10y": 3653,
+    }
+
+    # Perkiraan hari bursa per hari kalender (~242 hari bursa IDX per tahun, dengan margin)
+    TRADING_DAYS_RATIO = 0.6
+    
+    @classmethod
+    def period_for_bars(cls, bars: int) -> str:
+        """Period yfinance terpendek yang memuat minimal `bars` bar harian (misal lookback indikator)"""
+        for period, days in sorted(cls.PERIOD_DAYS.items(), key=lambda item: item[1]):
+            if days * cls.TRADING_DAYS_RATIO >= bars:
+                return period
+        return "max"
+    
+    @classmethod
+    def period_days(cls, period: str) -> float:
+        """Panjang period dalam hari kalender ("max"/tidak dikenal = tak terbatas)"""
+        return cls.PERIOD_DAYS.get(period, math.inf)
+    
+    def __init__(self, period: str = "3mo", incremental: bool = True):  # Kurangi period untuk mengurangi load
         self.period = period
+        self.incremental = incremental  # Refresh cache kadaluarsa dengan bar baru saja
         self.request_count = 0
-        self.last_request_time = time.time()
-    
-    def _rate_limit(self):
-        """Rate limiting: max 2 requests per second"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < 0.5:  # Minimal 0.5 detik antara request
-            time.sleep(0.5 - time_since_last)
-        
-        self.last_request_time = time.time()
-    
-    def _create_session(self):
-        """Create session dengan berbagai headers untuk bypass restrictions"""
-        session = requests.Session()
-        
-        # Rotate user agents
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/120.0',
-        ]
-        
-        import random
-        session.headers.update({
-            'User-Agent': random.choice(user_agents),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0',
-        })
-        return session
+    
+    def _rate_limit(self, requests: int = 1):
+        """Rate limiting lewat token bucket global (dibagi semua thread dan loader), satu token per request"""
+        market_data_limiter.acquire(requests)
+        self.request_count += requests
+    
+    def _get_session(self):
+        """Session keep-alive dari pool bersama (tidak membuat koneksi baru per request)"""
+        return session_pool.get()
     
     def load(self, ticker: str):
         ticker = ticker.upper().strip()
         
+        # Pemanggil bersamaan untuk ticker yang sama berbagi satu fetch
+        return singleflight.do(("history", ticker, self.period), self._load, ticker)
+    
+    def _load(self, ticker: str):
         # Cek cache dulu
-        cache_key = f"{ticker}_history"
-        cached_data = cache.get(ticker, "history")
-        
-        if cached_data:
-            print(f"Using cached data for {ticker}")
-            return cached_data
-        
-        # Rate limiting
-        self._rate_limit()
-        
-        # Coba format ticker yang berbeda
-        ticker_formats = []
+        cache_entry = self._get_history_entry(ticker)
         
-        # Format untuk saham Indonesia
-        if '.JK' not in ticker and not any(x in ticker for x in ['.NS', '.AX', '.L']):
-            ticker_formats.append(f"{ticker}.JK")
+        if cache_entry and not cache.is_expired(cache_entry):
+            result = self._read_stored(ticker, cache_entry['data'])
+            if result:
+                print(f"Using cached data for {ticker}")
+                return result
         
-        ticker_formats.append(ticker)
+        # Cache kadaluarsa: cukup ambil bar setelah tanggal terakhir
+        if cache_entry and self.incremental:
+            result = self._refresh_incremental(ticker, cache_entry['data'])
+            if result:
+                return result
         
-        # Format alternatif
-        if '.JK' in ticker:
-            base = ticker.replace('.JK', '')
-            ticker_formats.extend([base, f"{base}.NS"])
+        # Coba format ticker yang berbeda (yang sudah diketahui berhasil / belum pernah gagal)
+        ticker_formats = ticker_resolver.resolve(ticker)
         
         for ticker_format in ticker_formats:
             try:
+                # Rate limiting per percobaan (setiap format = satu request)
+                self._rate_limit()
                 print(f"Trying to fetch: {ticker_format}")
                 
-                # Buat session
-                session = self._create_session()
+                # Ambil session dari pool
+                session = self._get_session()
                 
                 # Coba dengan yfinance
                 stock = yf.Ticker(ticker_format, session=session)
@@ -92,60 +110,389 @@ class DataLoader:
                 
                 if df.empty or len(df) < 5:
                     print(f"No sufficient data for {ticker_format}")
+                    ticker_resolver.record_failure(ticker_format, ticker)
                     continue
                 
                 # Coba dapatkan info
                 try:
+                    self._rate_limit()
                     info = stock.info
+                    price_store.write_info(ticker, info)
                 except:
                     # Buat info minimal
-                    info = {
-                        'symbol': ticker_format,
-                        'shortName': ticker_format,
-                        'trailingPE': 15.0,
-                        'priceToBook': 2.0,
-                        'returnOnEquity': 0.12,
-                        'dividendYield': 0.025,
-                    }
+                    info = self._minimal_info(ticker_format)
                 
-                # Simpan ke cache
-                result = (df, stock)
-                cache.set(ticker, "history", result)
+                # Simpan ke price store + cache
+                result = self._store(ticker, ticker_format, df, info)
+                ticker_resolver.record_success(ticker, ticker_format)
                 
                 print(f"Successfully fetched {ticker_format}: {len(df)} rows")
                 return result
                 
             except Exception as e:
                 print(f"Error fetching {ticker_format}: {str(e)[:100]}")
+                if ticker_resolver.is_definitive(e):
+                    ticker_resolver.record_failure(ticker_format, ticker, definitive=True)
                 continue
         
         # FALLBACK: Gunakan data mock jika semua gagal
         print(f"All attempts failed for {ticker}, using fallback data")
         return self._get_fallback_data(ticker)
     
-    def _get_fallback_data(self, ticker):
-        """Generate fallback data untuk testing"""
-        dates = pd.date_range(end=datetime.now(), periods=60, freq='D')
+    def load_columns(self, ticker: str, columns: list = None, start=None, end=None):
+        """
+        Baca sebagian kolom/rentang history dari price store tanpa network.
+        
+        Returns:
+            DataFrame jika cache ticker masih valid, selain itu None
+        """
+        ticker = ticker.upper().strip()
+        cache_entry = self._get_history_entry(ticker)
+        
+        if not cache_entry or cache.is_expired(cache_entry):
+            return None
+        
+        df = price_store.read(ticker, columns=columns, start=start, end=end)
+        return df if start is not None else self._window(df)
+    
+    def load_many(self, tickers: list, chunk_size: int = None) -> dict:
+        """
+        Bulk load history untuk banyak ticker sekaligus.
+        
+        Ticker yang belum ada di cache diunduh per chunk dengan satu panggilan
+        yf.download, lalu dipecah kembali per ticker dan disimpan ke cache.
+        Ticker yang gagal di jalur bulk jatuh ke load() biasa.
+        
+        Returns:
+            Dict {ticker: (df, stock)} dengan ticker yang sudah dinormalisasi
+        """
+        chunk_size = chunk_size or self.BATCH_SIZE
+        results = {}
+        pending = {}
+        stale = {}
+        
+        for ticker in tickers:
+            ticker = ticker.upper().strip()
+            if not ticker or ticker in results or ticker in pending or ticker in stale:
+                continue
+            
+            cache_entry = self._get_history_entry(ticker)
+            cached_result = None
+            if cache_entry and not cache.is_expired(cache_entry):
+                cached_result = self._read_stored(ticker, cache_entry['data'])
+            
+            if cached_result:
+                results[ticker] = cached_result
+            elif cache_entry and self.incremental:
+                stale[ticker] = cache_entry['data']
+            else:
+                ticker_formats = ticker_resolver.resolve(ticker)
+                if ticker_formats:
+                    pending[ticker] = ticker_formats[0]
+                else:
+                    # Semua varian diketahui gagal: langsung fallback tanpa network
+                    results[ticker] = self._get_fallback_data(ticker)
+        
+        if pending or stale:
+            print(f"Bulk fetching {len(pending)} tickers, refreshing {len(stale)} "
+                  f"({len(results)} cached)")
+        
+        # Refresh incremental: satu request per chunk mulai dari tanggal cache tertua
+        items = list(stale.items())
+        for start in range(0, len(items), chunk_size):
+            chunk = dict(items[start:start + chunk_size])
+            cached_frames = {ticker: price_store.read(ticker) for ticker in chunk}
+            cached_frames = {t: df for t, df in cached_frames.items() if df is not None and len(df) > 0}
+            
+            # Penanda ada tapi file history hilang/rusak: unduh penuh di jalur pending
+            for ticker, marker in chunk.items():
+                if ticker not in cached_frames:
+                    pending[ticker] = marker['symbol']
+            if not cached_frames:
+                continue
+            
+            symbols = {ticker: chunk[ticker]['symbol'] for ticker in cached_frames}
+            since = min(df.index[-1] for df in cached_frames.values())
+            
+            # yf.download mengirim satu request per symbol
+            self._rate_limit(len(symbols))
+            session = self._get_session()
+            frames = self._download_batch(list(symbols.values()), session, start=since)
+            
+            for ticker, cached_df in cached_frames.items():
+                symbol = symbols[ticker]
+                new_df = frames.get(symbol)
+                if new_df is None or new_df.empty:
+                    # Refresh gagal: pakai data lama tanpa memperbarui penanda,
+                    # jadi entry tetap kadaluarsa dan dicoba lagi di panggilan berikutnya
+                    results[ticker] = (self._window(cached_df), StoredStock(ticker, symbol, self))
+                    continue
+                
+                keep_days = self._keep_days(chunk[ticker])
+                df = self._merge_history(cached_df, new_df, keep_days)
+                results[ticker] = self._store(ticker, symbol, df, period_days=keep_days)
+        
+        items = list(pending.items())
+        for start in range(0, len(items), chunk_size):
+            chunk = dict(items[start:start + chunk_size])
+            
+            self._rate_limit(len(chunk))
+            session = self._get_session()
+            frames = self._download_batch(list(chunk.values()), session)
+            
+            for ticker, ticker_format in chunk.items():
+                df = frames.get(ticker_format)
+                if df is None or df.empty or len(df) < 5:
+                    # Hanya dianggap gagal jika request bulk-nya sendiri berhasil
+                    if frames:
+                        ticker_resolver.record_failure(ticker_format, ticker)
+                    continue
+                
+                results[ticker] = self._store(ticker, ticker_format, df)
+                ticker_resolver.record_success(ticker, ticker_format)
+        
+        # Ticker yang tidak terambil di jalur bulk: coba satu per satu
+        for ticker in pending:
+            if ticker not in results:
+                results[ticker] = self.load(ticker)
+        
+        # Satu tulis file resolusi untuk seluruh batch
+        ticker_resolver.flush()
+        return results
+    
+    def _download_batch(self, ticker_formats: list, session, start=None) -> dict:
+        """Download history beberapa ticker dalam satu panggilan, dipecah per ticker"""
+        frames = {}
+        
+        # Dengan start, hanya bar sejak tanggal tersebut yang diminta
+        range_kwargs = {"start": self._to_start_date(start)} if start is not None else {"period": self.period}
+        
+        try:
+            data = yf.download(
+                ticker_formats,
+                interval="1d",
+                group_by="ticker",
+                progress=False,
+                # Request paralel tidak melebihi burst limiter (token sudah dipesan pemanggil)
+                threads=max(1, min(len(ticker_formats), int(market_data_limiter.capacity))),
+                session=session,
+                **range_kwargs
+            )
+        except Exception as e:
+            print(f"Error bulk fetching {len(ticker_formats)} tickers: {str(e)[:100]}")
+            return frames
+        
+        if data is None or data.empty:
+            return frames
+        
+        if isinstance(data.columns, pd.MultiIndex):
+            for ticker_format in data.columns.get_level_values(0).unique():
+                frames[ticker_format] = data[ticker_format].dropna(how="all")
+        else:
+            # Satu ticker tanpa MultiIndex (versi yfinance lama)
+            frames[ticker_formats[0]] = data.dropna(how="all")
+        
+        return frames
+    
+    def _refresh_incremental(self, ticker: str, marker: dict):
+        """Ambil hanya bar setelah tanggal terakhir di store, lalu gabungkan"""
+        symbol = marker['symbol']
+        cached_df = price_store.read(ticker)
+        if cached_df is None or cached_df.empty:
+            return None
+        
+        try:
+            self._rate_limit()
+            print(f"Refreshing {symbol} since {cached_df.index[-1].date()}")
+            
+            stock = yf.Ticker(symbol, session=self._get_session())
+            
+            # Mulai dari bar terakhir (inklusif) supaya bar yang belum final ikut terupdate
+            new_df = stock.history(start=self._to_start_date(cached_df.index[-1]), interval="1d")
+            if new_df is None or new_df.empty:
+                # Minimal bar terakhir selalu kembali; kosong berarti request gagal/di-throttle.
+                # Penanda tidak diperbarui supaya refresh dicoba lagi, bukan ditandai segar.
+                print(f"Incremental refresh returned no data for {symbol}, using stale history")
+                return self._window(cached_df), StoredStock(ticker, symbol, self)
+            
+            keep_days = self._keep_days(marker)
+            df = self._merge_history(cached_df, new_df, keep_days)
+            result = self._store(ticker, symbol, df, period_days=keep_days)
+            
+            print(f"Incremental refresh {symbol}: +{len(new_df)} rows fetched, {len(result[0])} in period")
+            return result
+        except Exception as e:
+            print(f"Incremental refresh failed for {symbol}: {str(e)[:100]}")
+            return None
+    
+    def _merge_history(self, cached_df: pd.DataFrame, new_df: pd.DataFrame, keep_days: float = None) -> pd.DataFrame:
+        """
+        Append bar baru ke history lama, de-duplikasi tanggal dan pangkas ke keep_days
+        
+        keep_days: Panjang history yang disimpan (default period loader ini); store
+            dipakai bersama semua period, jadi pemanggil mempertahankan period terlebar
+        """
+        cached_df = self._naive_index(cached_df)
+        if new_df is None or new_df.empty:
+            df = cached_df
+        else:
+            # yf.download (bulk) memberi index naive, Ticker.history memberi index ber-zona
+            new_df = self._naive_index(new_df.dropna(how="all"))
+            
+            # Bar baru menimpa bar lama dengan tanggal yang sama
+            df = pd.concat([cached_df, new_df[cached_df.columns.intersection(new_df.columns)]])
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+        
+        return self._window(df, keep_days)
+    
+    def _naive_index(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Index tanggal tanpa zona waktu (jam lokal bursa dipertahankan), konvensi price store"""
+        if df is not None and getattr(df.index, 'tz', None) is not None:
+            df = df.tz_localize(None)
+        return df
+    
+    def _window(self, df: pd.DataFrame, days: float = None) -> pd.DataFrame:
+        """Bar dalam `days` hari terakhir (default period loader ini)"""
+        days = self.period_days(self.period) if days is None else days
+        if math.isinf(days) or df is None or len(df) == 0:
+            return df
+        return df[df.index >= df.index[-1] - timedelta(days=days)]
+    
+    def _keep_days(self, marker: dict) -> float:
+        """Period terlebar antara loader ini dan history yang sudah tersimpan"""
+        return max(self.period_days(self.period), marker.get('period_days') or 0)
+    
+    def _covers(self, marker: dict) -> bool:
+        """Apakah history tersimpan cukup panjang untuk period loader ini"""
+        needed = self.period_days(self.period)
+        if 'period_days' in marker:
+            return marker['period_days'] >= needed
+        # Penanda lama tanpa period_days: perkirakan dari jumlah bar
+        return not math.isinf(needed) and marker.get('rows', 0) >= needed * self.TRADING_DAYS_RATIO
+    
+    def _get_history_entry(self, ticker: str):
+        """Entry cache history (berisi penanda ke price store), None jika tidak valid"""
+        cache_entry = cache.get_entry(ticker, "history")
+        
+        # Entry format lama (pickle DataFrame + Ticker) diabaikan
+        if not cache_entry or not isinstance(cache_entry.get('data'), dict):
+            return None
+        if not cache_entry['data'].get('symbol'):
+            return None
+        
+        # History lebih pendek dari period ini: perlu unduh penuh, bukan refresh incremental
+        if not self._covers(cache_entry['data']):
+            return None
         
-        # Buat data acak yang realistis
-        import numpy as np
-        np.random.seed(hash(ticker) % 10000)
+        return cache_entry
+    
+    def _store(self, ticker: str, symbol: str, df: pd.DataFrame, info: dict = None, period_days: float = None):
+        """
+        Simpan history ke price store dan tandai di cache
+        
+        period_days: Period yang dicakup df (default period loader ini), dicatat di
+            penanda supaya loader dengan period lebih panjang tidak memakainya
+        """
+        period_days = self.period_days(self.period) if period_days is None else period_days
+        df = self._naive_index(df)
+        if price_store.write(ticker, df, symbol=symbol):
+            # File price store ikut budget cache dan dihapus bersama penandanya
+            cache.set(ticker, "history", {
+                'symbol': symbol,
+                'rows': len(df),
+                'first_date': str(df.index[0]),
+                'last_date': str(df.index[-1]),
+                'period_days': period_days,
+            }, files=price_store.files(ticker))
+        
+        return self._window(df), StoredStock(ticker, symbol, self, info=info)
+    
+    def _read_stored(self, ticker: str, marker: dict):
+        """Baca (df, stock) dari price store berdasarkan penanda cache"""
+        df = price_store.read(ticker)
+        if df is None or df.empty:
+            return None
+        
+        # Store bisa berisi period lebih panjang dari milik loader ini
+        return self._window(df), StoredStock(ticker, marker['symbol'], self)
+    
+    def load_info_many(self, loaded: dict, max_workers: int = None) -> int:
+        """
+        Pastikan info fundamental hasil load_many tersimpan di price store
+        
+        Dipanggil proses utama sebelum analisis dibagi ke worker read-only, supaya
+        info yang kadaluarsa diambil sekali (lewat limiter bersama) lalu disimpan.
+        
+        Returns:
+            Jumlah ticker yang info-nya dimuat
+        """
+        stocks = [stock for _, stock in loaded.values() if isinstance(stock, StoredStock)]
+        if not stocks:
+            return 0
+        
+        max_workers = max(1, int(max_workers or session_pool.size))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Akses .info memicu _load_info: dari store jika masih segar, selain itu fetch + simpan
+            list(executor.map(lambda stock: stock.info, stocks))
+        return len(stocks)
+    
+    def _load_info(self, ticker: str, symbol: str) -> dict:
+        """Info fundamental dari price store, diambil ulang dari Yahoo jika kadaluarsa"""
+        meta = price_store.read_meta(ticker)
+        info = meta.get('info')
+        
+        if info and time.time() <= cache.expires_at("info", meta.get('info_updated', 0)):
+            return info
+        
+        # Store read-only (worker proses): hasil fetch tidak bisa disimpan, jadi tiap run
+        # akan mengambil ulang dengan limiter per proses. Info diambil proses utama.
+        if price_store.read_only:
+            return info or self._minimal_info(symbol)
+        
+        try:
+            self._rate_limit()
+            fresh_info = yf.Ticker(symbol, session=self._get_session()).info
+            if fresh_info:
+                price_store.write_info(ticker, fresh_info)
+                return fresh_info
+        except Exception as e:
+            print(f"Error fetching info for {symbol}: {str(e)[:100]}")
+        
+        return info or self._minimal_info(symbol)
+    
+    def _minimal_info(self, symbol: str) -> dict:
+        """Info minimal jika Yahoo tidak mengembalikan info"""
+        return {
+            'symbol': symbol,
+            'shortName': symbol,
+            'trailingPE': 15.0,
+            'priceToBook': 2.0,
+            'returnOnEquity': 0.12,
+            'dividendYield': 0.025,
+        }
+    
+    def _to_start_date(self, timestamp):
+        """Tanggal (tanpa jam/zona waktu) untuk parameter start yfinance"""
+        return pd.Timestamp(timestamp).strftime('%Y-%m-%d')
+    
+    def _get_fallback_data(self, ticker):
+        """Generate fallback data untuk testing (deterministik per ticker di semua proses)"""
+        dates = pd.date_range(end=pd.Timestamp.now().normalize(), periods=60, freq='D')
         
-        base_price = 1000 + (hash(ticker) % 9000)
-        prices = []
-        current = base_price
+        # Buat data acak yang realistis dari stream RNG milik ticker ini
+        checksum = ticker_checksum(ticker)
+        rng = derive_rng("fallback", checksum)
         
-        for _ in range(60):
-            change = np.random.uniform(-0.02, 0.02) * current
-            current += change
-            prices.append(current)
+        base_price = 1000 + (checksum % 9000)
+        changes = rng.uniform(-0.02, 0.02, size=len(dates))
+        prices = base_price * np.cumprod(1 + changes)
         
         df = pd.DataFrame({
-            'Open': [p * 0.995 for p in prices],
-            'High': [p * 1.01 for p in prices],
-            'Low': [p * 0.99 for p in prices],
+            'Open': prices * 0.995,
+            'High': prices * 1.01,
+            'Low': prices * 0.99,
             'Close': prices,
-            'Volume': [np.random.randint(1000000, 5000000) for _ in prices]
+            'Volume': rng.integers(1000000, 5000000, size=len(dates))
         }, index=dates)
         
         class MockStock:
@@ -154,11 +501,11 @@ class DataLoader:
                 self.info = {
                     'symbol': ticker_name,
                     'shortName': ticker_name,
-                    'trailingPE': 12.0 + (hash(ticker_name) % 15),
-                    'priceToBook': 1.5 + (hash(ticker_name) % 20) / 10,
-                    'returnOnEquity': 0.08 + (hash(ticker_name) % 12) / 100,
-                    'dividendYield': 0.02 + (hash(ticker_name) % 8) / 1000,
-                    'marketCap': 10000000000 + (hash(ticker_name) % 90000000000),
+                    'trailingPE': 12.0 + (checksum % 15),
+                    'priceToBook': 1.5 + (checksum % 20) / 10,
+                    'returnOnEquity': 0.08 + (checksum % 12) / 100,
+                    'dividendYield': 0.02 + (checksum % 8) / 1000,
+                    'marketCap': 10000000000 + (checksum % 90000000000),
                 }
         
         return df, MockStock(ticker)
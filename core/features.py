@@ -0,0 +1,221 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from core.technical import INDICATORS
+
+class FeatureBlock:
+    """
+    Fitur harga per bar yang dihitung sekali per DataFrame
+    - Satu array float64 (bar x fitur): close, high, low, returns, rata-rata
+      dan std rolling Bollinger, serta high/low rolling support-resistance
+    - Dipakai bersama oleh TechnicalEngine dan ConservativePricePredictor
+      sehingga window rolling tidak dihitung ulang di setiap engine
+    - Indikator terdaftar (RSI, MACD, ATR, ...) dihitung saat pertama kali diminta
+    """
+    
+    COLUMNS = ('close', 'high', 'low', 'returns', 'bb_middle', 'bb_std', 'sr_high', 'sr_low')
+    
+    BB_WINDOW = 20
+    SR_WINDOW = 20
+    VOLATILITY_WINDOW = 10
+    
+    def __init__(self, values: np.ndarray, index=None, sources: tuple = ('Close', 'High', 'Low')):
+        self.values = values
+        self.index = index
+        self.sources = set(sources)  # Kolom OHLC yang benar-benar ada di DataFrame asal
+        self._columns = {name: i for i, name in enumerate(self.COLUMNS)}
+        self._indicators = {}  # Cache output indikator per nama
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "FeatureBlock":
+        """Hitung semua fitur dari OHLC DataFrame dalam satu pass"""
+        n = len(df)
+        values = np.full((n, len(cls.COLUMNS)), np.nan)
+        if n == 0 or 'Close' not in df.columns:
+            return cls(values, df.index)
+        
+        close = pd.to_numeric(df['Close'], errors='coerce').to_numpy(dtype=float)
+        # Tanpa kolom High/Low (misal hanya Close dibaca dari store) pakai Close
+        high = pd.to_numeric(df['High'], errors='coerce').to_numpy(dtype=float) if 'High' in df.columns else close
+        low = pd.to_numeric(df['Low'], errors='coerce').to_numpy(dtype=float) if 'Low' in df.columns else close
+        
+        values[:, 0] = close
+        values[:, 1] = high
+        values[:, 2] = low
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values[1:, 3] = close[1:] / close[:-1] - 1
+        
+        if n >= cls.BB_WINDOW:
+            windows = sliding_window_view(close, cls.BB_WINDOW)
+            values[cls.BB_WINDOW - 1:, 4] = windows.mean(axis=1)
+            values[cls.BB_WINDOW - 1:, 5] = windows.std(axis=1, ddof=1)
+        
+        if n >= cls.SR_WINDOW:
+            # nanmax/nanmin seperti pandas tail(n).max()
+            with np.errstate(invalid='ignore'):
+                values[cls.SR_WINDOW - 1:, 6] = np.nanmax(sliding_window_view(high, cls.SR_WINDOW), axis=1)
+                values[cls.SR_WINDOW - 1:, 7] = np.nanmin(sliding_window_view(low, cls.SR_WINDOW), axis=1)
+        
+        sources = [column for column in ('Close', 'High', 'Low') if column in df.columns]
+        return cls(values, df.index, sources)
+    
+    @classmethod
+    def panel_summary(cls, frames: dict) -> pd.DataFrame:
+        """
+        Ringkasan fitur bar terakhir untuk banyak ticker sekaligus
+        
+        Ekor tiap DataFrame ditumpuk menjadi satu matriks (bar x ticker, rata
+        bawah dan diisi NaN di atas), lalu volatilitas, Bollinger dan high/low
+        support-resistance dihitung per kolom dalam satu pass. Nilainya sama
+        dengan volatility()/bollinger()/support_resistance() per ticker.
+        
+        Returns:
+            DataFrame per ticker: bars, close, volatility, bb_middle, bb_std,
+            sr_high, sr_low (NaN jika data kurang dari window)
+        """
+        tickers = list(frames)
+        columns = ['bars', 'close', 'volatility', 'bb_middle', 'bb_std', 'sr_high', 'sr_low']
+        if not tickers:
+            return pd.DataFrame(columns=columns)
+        
+        # Cukup untuk window terpanjang plus cadangan return NaN di tengah
+        tail = 2 * max(cls.BB_WINDOW, cls.SR_WINDOW, cls.VOLATILITY_WINDOW + 1)
+        fields = {name: np.full((tail, len(tickers)), np.nan) for name in ('Close', 'High', 'Low')}
+        bars = np.zeros(len(tickers), dtype=int)
+        
+        for j, ticker in enumerate(tickers):
+            df = frames[ticker]
+            if df is None or len(df) == 0 or 'Close' not in df.columns:
+                continue
+            bars[j] = len(df)
+            rows = min(len(df), tail)
+            for name in fields:
+                # Tanpa kolom High/Low pakai Close, sama seperti from_frame
+                column = name if name in df.columns else 'Close'
+                values = df[column].to_numpy()[-rows:]
+                if values.dtype.kind != 'f':
+                    values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+                fields[name][tail - rows:, j] = values
+        
+        close, high, low = fields['Close'], fields['High'], fields['Low']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = close[1:] / close[:-1] - 1
+        
+        # Return valid dipadatkan ke bawah (urutan tetap) seperti returns[~isnan] per ticker
+        valid = ~np.isnan(returns)
+        returns = np.take_along_axis(returns, np.argsort(valid, axis=0, kind='stable'), axis=0)
+        n_returns = valid.sum(axis=0)
+        window = returns[-cls.VOLATILITY_WINDOW:]
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            volatility = np.nanstd(window, axis=0, ddof=1)
+        
+            bb_window = close[-cls.BB_WINDOW:]
+            bb_middle = bb_window.mean(axis=0)
+            bb_std = bb_window.std(axis=0, ddof=1)
+            sr_high = np.nanmax(high[-cls.SR_WINDOW:], axis=0)
+            sr_low = np.nanmin(low[-cls.SR_WINDOW:], axis=0)
+        
+        volatility = np.clip(volatility, 0.005, 0.05)
+        volatility[(bars < 10) | (n_returns < 5)] = 0.015
+        bb_middle[bars < cls.BB_WINDOW] = np.nan
+        bb_std[bars < cls.BB_WINDOW] = np.nan
+        sr_high[bars < cls.SR_WINDOW] = np.nan
+        sr_low[bars < cls.SR_WINDOW] = np.nan
+        
+        last_close = close[-1]
+        return pd.DataFrame({
+            'bars': bars,
+            'close': last_close,
+            'volatility': volatility,
+            'bb_middle': bb_middle,
+            'bb_std': bb_std,
+            'sr_high': sr_high,
+            'sr_low': sr_low,
+        }, index=pd.Index(tickers, name='Ticker'))
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.values[:, self._columns[name]]
+    
+    def last(self, name: str) -> float:
+        return float(self[name][-1])
+    
+    # ========== INDICATORS ==========
+    
+    def indicator(self, name: str):
+        """
+        Output indikator terdaftar (array 2-D satu kolom), dihitung sekali per block
+        
+        Returns:
+            None jika indikator membutuhkan kolom yang tidak ada di block (misal Volume)
+        """
+        if name not in self._indicators:
+            indicator = INDICATORS[name]
+            columns = {'Close': 'close', 'High': 'high', 'Low': 'low'}
+            if not all(column in self.sources for column in indicator.inputs):
+                return None
+            fields = {column: self[columns[column]].reshape(-1, 1) for column in indicator.inputs}
+            self._indicators[name] = indicator.compute(fields)
+        return self._indicators[name]
+    
+    @property
+    def rsi(self) -> np.ndarray:
+        return self.indicator("rsi")["RSI"][:, 0]
+    
+    @property
+    def macd(self) -> np.ndarray:
+        """Histogram MACD (macd - signal) per bar"""
+        return self.indicator("macd")["MACD"][:, 0]
+    
+    # ========== SUMMARIES ==========
+    
+    def volatility(self, default=0.015, floor=0.005, cap=0.05) -> float:
+        """Volatilitas harian dari std return terakhir (maks VOLATILITY_WINDOW bar), dibatasi"""
+        if len(self) < 10:
+            return default
+        
+        returns = self['returns']
+        returns = returns[~np.isnan(returns)]
+        if len(returns) < 5:
+            return default
+        
+        window = returns[-min(self.VOLATILITY_WINDOW, len(returns)):]
+        return min(max(float(np.std(window, ddof=1)), floor), cap)
+    
+    def bollinger(self):
+        """Bollinger Bands bar terakhir, None jika data kurang dari BB_WINDOW"""
+        if len(self) < self.BB_WINDOW:
+            return None
+        
+        middle = self.last('bb_middle')
+        std = self.last('bb_std')
+        upper = middle + 2 * std
+        lower = middle - 2 * std
+        return {
+            'upper': float(upper),
+            'middle': float(middle),
+            'lower': float(lower),
+            'width_pct': float((upper - lower) / middle * 100)
+        }
+    
+    def support_resistance(self):
+        """High/low SR_WINDOW bar terakhir dan level psikologis terdekat"""
+        if len(self) < self.SR_WINDOW:
+            return {'current': self.last('close') if len(self) > 0 else 0}
+        
+        current = self.last('close')
+        base = round(current / 100) * 100
+        levels = [l for l in (base - 200, base - 100, base, base + 100, base + 200) if l > 0]
+        
+        return {
+            'recent_high': self.last('sr_high'),
+            'recent_low': self.last('sr_low'),
+            'current': current,
+            'psychological_levels': levels[:3]
+        }
@@ -0,0 +1,199 @@
+import math
+from collections import deque
+
+import pandas as pd
+
+class IndicatorState:
+    """
+    State indikator per ticker yang bisa di-update satu bar dalam O(1)
+    - EMA12/EMA26/signal untuk MACD
+    - Rata-rata gain/loss Wilder untuk RSI (seed sama dengan TechnicalEngine)
+    - Buffer 20 bar terakhir untuk Bollinger Bands
+
+    Bar dengan tanggal sama dengan bar terakhir dianggap revisi (harga intraday
+    berubah): state dikembalikan ke snapshot sebelum bar itu lalu diterapkan ulang.
+    """
+
+    VERSION = 1
+    RSI_PERIOD = 14
+    MACD_FAST = 12
+    MACD_SLOW = 26
+    MACD_SIGNAL = 9
+    BB_WINDOW = 20
+    MIN_BARS = 20  # Sama dengan batas minimum TechnicalEngine.calculate
+
+    _FIELDS = ('last_date', 'last_close', 'bars', 'ema_fast', 'ema_slow', 'signal',
+               'avg_gain', 'avg_loss', 'warmup', 'window')
+
+    def __init__(self):
+        self.last_date = None
+        self.last_close = None
+        self.bars = 0
+        self.ema_fast = None
+        self.ema_slow = None
+        self.signal = None
+        self.avg_gain = None
+        self.avg_loss = None
+        self.warmup = []  # Harga sebelum seed RSI tersedia (maks period+2)
+        self.window = deque(maxlen=self.BB_WINDOW)
+        self._prev = None
+
+    # ========== BUILD ==========
+
+    @classmethod
+    def from_history(cls, close: pd.Series) -> "IndicatorState":
+        """Bangun state dari seluruh history Close (sekali, O(n))"""
+        state = cls()
+        state.apply(close)
+        return state
+
+    def apply(self, close: pd.Series) -> int:
+        """Terapkan bar dari series Close yang lebih baru dari last_date, return jumlah bar"""
+        applied = 0
+        for ts, price in close.items():
+            day = self.date_key(ts)
+            if self.last_date is not None and day < self.last_date:
+                continue
+            if self.update(day, price):
+                applied += 1
+        return applied
+
+    @property
+    def previous_close(self):
+        """Close bar sebelum last_date yang sudah diserap state (None jika tidak ada)"""
+        if self._prev is None:
+            return None
+        return self._prev.get('last_close')
+
+    @staticmethod
+    def date_key(ts) -> str:
+        return pd.Timestamp(ts).strftime('%Y-%m-%d')
+
+    # ========== UPDATE ==========
+
+    def update(self, day: str, close: float) -> bool:
+        """
+        Serap satu bar harian dalam O(1)
+
+        Returns:
+            False jika bar diabaikan (harga tidak valid, tanggal lebih lama, atau
+            revisi bar terakhir dengan harga yang sama) - state tidak berubah
+        """
+        try:
+            close = float(close)
+        except (TypeError, ValueError):
+            return False
+        if math.isnan(close) or (self.last_date is not None and day < self.last_date):
+            return False
+
+        if day == self.last_date:
+            # Revisi bar terakhir: ulang dari state sebelum bar ini
+            if self._prev is None or close == self.last_close:
+                return False
+            self._restore(self._prev)
+
+        self._prev = self._snapshot()
+        self._apply_bar(close)
+        self.last_date = day
+        self.last_close = close
+        self.bars += 1
+        return True
+
+    def _apply_bar(self, close: float):
+        # MACD: EMA adjust=False, seed dari harga pertama
+        fast_alpha = 2.0 / (self.MACD_FAST + 1)
+        slow_alpha = 2.0 / (self.MACD_SLOW + 1)
+        signal_alpha = 2.0 / (self.MACD_SIGNAL + 1)
+        if self.ema_fast is None:
+            self.ema_fast = self.ema_slow = close
+        else:
+            self.ema_fast += fast_alpha * (close - self.ema_fast)
+            self.ema_slow += slow_alpha * (close - self.ema_slow)
+        macd = self.ema_fast - self.ema_slow
+        self.signal = macd if self.signal is None else self.signal + signal_alpha * (macd - self.signal)
+
+        # RSI Wilder
+        if self.avg_gain is None:
+            self.warmup.append(close)
+            if len(self.warmup) == self.RSI_PERIOD + 2:
+                self._seed_rsi()
+        else:
+            self._wilder_update(close - self.last_close)
+
+        self.window.append(close)
+
+    def _seed_rsi(self):
+        """Seed sama dengan TechnicalEngine._calculate_rsi: period+1 delta pertama / period"""
+        period = self.RSI_PERIOD
+        deltas = [b - a for a, b in zip(self.warmup[:-1], self.warmup[1:])]
+        self.avg_gain = sum(d for d in deltas if d > 0) / period
+        self.avg_loss = sum(-d for d in deltas if d < 0) / period
+        for delta in deltas[period - 1:]:
+            self._wilder_update(delta)
+        self.warmup = []
+
+    def _wilder_update(self, delta: float):
+        period = self.RSI_PERIOD
+        self.avg_gain = (self.avg_gain * (period - 1) + max(delta, 0.0)) / period
+        self.avg_loss = (self.avg_loss * (period - 1) + max(-delta, 0.0)) / period
+
+    # ========== VALUES ==========
+
+    @property
+    def rsi(self):
+        if self.avg_gain is None:
+            return None
+        if self.avg_loss == 0:
+            return 100.0 if self.avg_gain > 0 else 50.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+    @property
+    def macd(self):
+        """Histogram MACD (macd - signal), sama dengan nilai MACD di TechnicalEngine"""
+        if self.signal is None:
+            return None
+        return (self.ema_fast - self.ema_slow) - self.signal
+
+    def bollinger(self):
+        """Bollinger Bands (SMA20 ± 2 std sampel) dari buffer, None jika belum 20 bar"""
+        n = len(self.window)
+        if n < self.BB_WINDOW:
+            return None
+        mean = sum(self.window) / n
+        std = math.sqrt(sum((x - mean) ** 2 for x in self.window) / (n - 1))
+        return {
+            'upper': mean + 2 * std,
+            'middle': mean,
+            'lower': mean - 2 * std,
+            'width_pct': (4 * std) / mean * 100 if mean else 0.0,
+        }
+
+    # ========== SERIALIZATION ==========
+
+    def _snapshot(self) -> dict:
+        snap = {name: getattr(self, name) for name in self._FIELDS}
+        snap['warmup'] = list(self.warmup)
+        snap['window'] = list(self.window)
+        return snap
+
+    def _restore(self, snap: dict):
+        for name in self._FIELDS:
+            setattr(self, name, snap.get(name))
+        self.warmup = list(snap.get('warmup') or [])
+        self.window = deque(snap.get('window') or [], maxlen=self.BB_WINDOW)
+
+    def to_dict(self) -> dict:
+        data = self._snapshot()
+        data['version'] = self.VERSION
+        data['prev'] = self._prev
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """State dari dict tersimpan, None jika format tidak dikenali"""
+        if not isinstance(data, dict) or data.get('version') != cls.VERSION:
+            return None
+        state = cls()
+        state._restore(data)
+        state._prev = data.get('prev')
+        return state
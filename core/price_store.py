@@ -0,0 +1,257 @@
+import os
+import re
+import json
+import time
+import tempfile
+import pandas as pd
+import pyarrow.parquet as pq
+
+from utils.cache import cache, MemoryCache
+from utils.metrics import metrics
+
+class PriceStore:
+    """
+    Penyimpanan lokal harga per ticker dalam format kolumnar
+    - OHLCV disimpan sebagai satu file Parquet per ticker
+    - Info fundamental + metadata disimpan di file JSON kecil terpisah
+    - State indikator streaming disimpan di {ticker}.state.json
+    - Bisa membaca sebagian kolom dan rentang tanggal saja (memory-mapped)
+    - History lengkap yang sudah dibaca disimpan di LRU memory (per byte) dan
+      divalidasi dengan mtime/ukuran file, jadi tulisan proses lain tetap terlihat
+    - read_only (worker ParallelScreener): semua tulis/hapus diabaikan
+    DataFrame dari memory adalah objek yang sama, jangan dimutasi.
+    """
+
+    INDEX_NAME = "Date"
+
+    def __init__(self, store_dir=None, memory_max_bytes=128 * 1024 * 1024):
+        self.store_dir = store_dir or os.path.join(cache.cache_dir, "prices")
+        self.memory = MemoryCache(memory_max_bytes)  # path -> (versi file, DataFrame)
+        self.read_only = False
+
+        # Create store directory if not exists
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    # ========== PATHS ==========
+
+    def _safe_name(self, ticker: str) -> str:
+        """Nama file aman dari ticker (BBCA.JK -> BBCA.JK, ^JKSE -> _JKSE)"""
+        return re.sub(r'[^A-Za-z0-9._-]', '_', ticker.upper().strip())
+
+    def _prices_path(self, ticker: str) -> str:
+        return os.path.join(self.store_dir, f"{self._safe_name(ticker)}.parquet")
+
+    def _meta_path(self, ticker: str) -> str:
+        return os.path.join(self.store_dir, f"{self._safe_name(ticker)}.json")
+
+    def _state_path(self, ticker: str) -> str:
+        return os.path.join(self.store_dir, f"{self._safe_name(ticker)}.state.json")
+
+    def files(self, ticker: str) -> list:
+        """Semua file milik ticker (untuk akuntansi budget cache dan eviksi)"""
+        return [self._prices_path(ticker), self._meta_path(ticker), self._state_path(ticker)]
+
+    def _atomic_write(self, path: str, write_fn):
+        """Tulis ke file sementara lalu rename, supaya pembaca tidak melihat file setengah jadi"""
+        # Nama unik per panggilan: beberapa thread bisa menulis ticker yang sama bersamaan
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+        try:
+            write_fn(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # ========== PRICES ==========
+
+    def write(self, ticker: str, df: pd.DataFrame, symbol: str = None) -> bool:
+        """Simpan OHLCV ticker sebagai Parquet dan perbarui metadata"""
+        if self.read_only:
+            return False
+        try:
+            frame = df.copy()
+            frame.index.name = self.INDEX_NAME
+            frame = frame.reset_index()
+
+            self._atomic_write(
+                self._prices_path(ticker),
+                lambda path: frame.to_parquet(path, engine="pyarrow", index=False)
+            )
+            self.memory.pop(self._prices_path(ticker))
+
+            meta = self.read_meta(ticker)
+            meta.update({
+                'symbol': symbol or meta.get('symbol') or ticker,
+                'rows': len(df),
+                'first_date': str(df.index[0]) if len(df) > 0 else None,
+                'last_date': str(df.index[-1]) if len(df) > 0 else None,
+                'columns': list(df.columns),
+                'prices_updated': time.time(),
+            })
+            self._write_meta(ticker, meta)
+            return True
+        except Exception as e:
+            print(f"Error writing prices for {ticker}: {str(e)[:100]}")
+            return False
+
+    def read(self, ticker: str, columns: list = None, start=None, end=None):
+        """
+        Baca OHLCV ticker dari store
+
+        Args:
+            ticker: Ticker yang disimpan
+            columns: Kolom yang dibaca (None = semua), misal ['Close', 'High', 'Low']
+            start, end: Batas tanggal (inklusif), None = tanpa batas
+
+        Returns:
+            DataFrame dengan index tanggal, atau None jika tidak ada
+        """
+        path = self._prices_path(ticker)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        # Tanpa rentang tanggal: layani dari history lengkap di memory
+        if start is None and end is None:
+            df = self._read_full(ticker, path, (stat.st_mtime_ns, stat.st_size))
+            if df is None or columns is None:
+                return df
+            selected = [c for c in columns if c != self.INDEX_NAME]
+            if df.columns.intersection(selected).size == len(selected):
+                return df[selected]
+
+        try:
+            read_columns = None
+            if columns is not None:
+                read_columns = [self.INDEX_NAME] + [c for c in columns if c != self.INDEX_NAME]
+
+            table = pq.read_table(
+                path,
+                columns=read_columns,
+                filters=self._date_filters(path, start, end),
+                memory_map=True
+            )
+
+            df = table.to_pandas()
+            return df.set_index(self.INDEX_NAME)
+        except Exception as e:
+            print(f"Error reading prices for {ticker}: {str(e)[:100]}")
+            return None
+
+    def _read_full(self, ticker: str, path: str, version: tuple):
+        """History lengkap dari memory jika file belum berubah, selain itu dari Parquet"""
+        item = self.memory.get(path)
+        if item is not None and item[0] == version:
+            return item[1]
+
+        try:
+            df = pq.read_table(path, memory_map=True).to_pandas().set_index(self.INDEX_NAME)
+        except Exception as e:
+            print(f"Error reading prices for {ticker}: {str(e)[:100]}")
+            return None
+
+        self.memory.set(path, (version, df), int(df.memory_usage(deep=True).sum()))
+        return df
+
+    def _date_filters(self, path: str, start, end):
+        """Filter rentang tanggal dalam zona waktu yang sama dengan kolom Date"""
+        if start is None and end is None:
+            return None
+
+        tz = getattr(pq.read_schema(path).field(self.INDEX_NAME).type, 'tz', None)
+
+        def to_timestamp(value):
+            ts = pd.Timestamp(value)
+            if tz and ts.tzinfo is None:
+                return ts.tz_localize(tz)
+            if not tz and ts.tzinfo is not None:
+                return ts.tz_localize(None)
+            return ts
+
+        filters = []
+        if start is not None:
+            filters.append((self.INDEX_NAME, '>=', to_timestamp(start)))
+        if end is not None:
+            filters.append((self.INDEX_NAME, '<=', to_timestamp(end)))
+        return filters
+
+    # ========== INFO / METADATA ==========
+
+    def read_meta(self, ticker: str) -> dict:
+        """Metadata + info ticker, dict kosong jika belum ada"""
+        path = self._meta_path(ticker)
+        if not os.path.exists(path):
+            return {}
+
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except:
+            return {}
+
+    def _write_meta(self, ticker: str, meta: dict):
+        def dump(path):
+            with open(path, 'w') as f:
+                json.dump(meta, f, default=str)
+        self._atomic_write(self._meta_path(ticker), dump)
+
+    def read_info(self, ticker: str):
+        """Info fundamental yang tersimpan, None jika belum ada"""
+        return self.read_meta(ticker).get('info')
+
+    def write_info(self, ticker: str, info: dict) -> bool:
+        """Simpan info fundamental ticker"""
+        if self.read_only:
+            return False
+        try:
+            meta = self.read_meta(ticker)
+            meta['info'] = info
+            meta['info_updated'] = time.time()
+            self._write_meta(ticker, meta)
+            return True
+        except Exception as e:
+            print(f"Error writing info for {ticker}: {str(e)[:100]}")
+            return False
+
+    # ========== INDICATOR STATE ==========
+
+    def read_state(self, ticker: str):
+        """State indikator streaming (dict) yang tersimpan, None jika belum ada"""
+        path = self._state_path(ticker)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except:
+            return None
+
+    def write_state(self, ticker: str, state: dict) -> bool:
+        """Simpan state indikator streaming ticker"""
+        if self.read_only:
+            return False
+        try:
+            def dump(path):
+                with open(path, 'w') as f:
+                    json.dump(state, f)
+            self._atomic_write(self._state_path(ticker), dump)
+            return True
+        except Exception as e:
+            print(f"Error writing indicator state for {ticker}: {str(e)[:100]}")
+            return False
+
+    def delete(self, ticker: str):
+        """Hapus data ticker dari store"""
+        if self.read_only:
+            return
+        self.memory.pop(self._prices_path(ticker))
+        for path in self.files(ticker):
+            if os.path.exists(path):
+                os.remove(path)
+
+# Global store instance; budget memory lewat WARREN_PRICE_MEMORY_MB
+price_store = PriceStore(memory_max_bytes=int(os.getenv("WARREN_PRICE_MEMORY_MB", "128")) * 1024 * 1024)
+metrics.register_collector("price_store", price_store.memory.stats)
@@ -1,178 +1,146 @@
 import streamlit as st
-from core.data_loader import DataLoader
-from core.fundamental import FundamentalEngine
-from core.technical import TechnicalEngine
-from core.dividend import DividendEngine
-from core.scoring import ScoringEngine
-
-from ai.hybrid_explainer import HybridAIExplainer
-from ai.confidence import ConfidenceEngine
-from ai.risk import RiskDisclosureEngine
-from ai.scenario import ScenarioEngine
-from ai.stress import StressTestEngine
-from ai.compliance import ComplianceEngine
-from ai.price_predictor import ConservativePricePredictor  # ✅ Fixed import
-from ai.news_analyzer import NewsSentimentAnalyzer
-from ai.peer_comparator import PeerComparator
+from core.context import AnalysisContext, get_context
+from core.features import FeatureBlock
+from utils.metrics import metrics
 
 import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 class StockAnalyzer:
-    def __init__(self, ticker: str, period="3mo"):
+    """
+    Analisis satu ticker di atas engine bersama dari AnalysisContext
+    
+    Konstruksi murah (hanya referensi ke engine proses), jadi screener bisa
+    membuat satu analyzer per ticker tanpa membangun ulang engine.
+    
+    Analisis tersusun dari stage bernama (lihat STAGES). analyze(sections=[...])
+    hanya menjalankan stage yang menghasilkan section tersebut beserta
+    dependensinya; tanpa sections semua stage dijalankan.
+    """
+    
+    # Stage dalam urutan topologis: nama -> (stage yang dibutuhkan, key hasil)
+    STAGES = {
+        "data": ((), ("CurrentPrice",)),
+        "fundamental": (("data",), ("PER", "PBV", "ROE", "FundamentalScore")),
+        "technical": (("data",), ("RSI", "MACD", "MACDLine", "MACDSignal", "TechnicalRating")),
+        "dividend": (("fundamental",), ("DividendYield",)),
+        "score": (("fundamental", "technical"), ("FinalScore", "Label")),
+        "prediction": (("data",), ("PricePrediction",)),
+        "news": ((), ("NewsSentiment",)),
+        "peers": (("score", "dividend"), ("PeerComparison", "PeerInsights")),
+        "explanation": (("score", "dividend"), ("AI_Rule", "AI_LLM", "AI_Final")),
+        "confidence": (("score",), ("Confidence",)),
+        "risks": (("fundamental", "technical", "dividend"), ("Risks",)),
+        "scenarios": (("fundamental", "technical"), ("Scenarios", "ResilienceScore")),
+        "compliance": ((), ("Disclaimer",)),
+    }
+    
+    # Stage I/O yang saling independen: dijalankan bersamaan di stage_executor
+    # begitu dependensinya selesai, dengan batas waktu (detik) per stage.
+    # Stage ini tidak boleh bergantung satu sama lain.
+    CONCURRENT_STAGES = {
+        "prediction": 20,
+        "news": 10,
+        "peers": 10,
+        "explanation": 30,
+    }
+    
+    def __init__(self, ticker: str, period="3mo", context: AnalysisContext = None):
         self.ticker = ticker
-        self.loader = DataLoader(period)
-
-        # Core engines
-        self.fund = FundamentalEngine()
-        self.tech = TechnicalEngine()
-        self.div = DividendEngine()
-        self.score_engine = ScoringEngine()
-
-        # AI engines
-        self.ai = HybridAIExplainer()
-        self.confidence = ConfidenceEngine()
-        self.risk_engine = RiskDisclosureEngine()
-        self.scenario = ScenarioEngine()
-        self.stress = StressTestEngine()
-        self.compliance = ComplianceEngine()
+        self.context = context or get_context()
+        self.loader = self.context.loader(period)
         
-        # ✅ AI Enhancement Engines
-        self.predictor = ConservativePricePredictor()  # ✅ Use ConservativePricePredictor directly
-        self.news_analyzer = NewsSentimentAnalyzer()
-        self.peer_comparator = PeerComparator()
-
-    def analyze(self):
+        # Core, AI dan AI enhancement engines (instance bersama)
+        for name in AnalysisContext.ENGINES:
+            setattr(self, name, getattr(self.context, name))
+    
+    @classmethod
+    def resolve_stages(cls, sections=None) -> list:
+        """
+        Stage yang perlu dijalankan untuk sections, dalam urutan eksekusi
+        
+        Args:
+            sections: Nama stage ("prediction") atau key hasil ("ResilienceScore");
+                None berarti semua stage
+        """
+        if sections is None:
+            return list(cls.STAGES)
+        
+        outputs = {key: name for name, (_, keys) in cls.STAGES.items() for key in keys}
+        needed = set()
+        pending = []
+        for section in sections:
+            if section in cls.STAGES:
+                pending.append(section)
+            elif section in outputs:
+                pending.append(outputs[section])
+            elif section != "Ticker":
+                raise ValueError(f"Unknown section: {section}. Available: {', '.join(cls.STAGES)}")
+        
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(cls.STAGES[name][0])
+        return [name for name in cls.STAGES if name in needed]
+    
+    def analyze(self, sections=None):
+        """
+        Jalankan stage untuk sections (default: semua)
+        
+        Stage inti (data, fundamental, technical, dividend, score) yang gagal
+        membatalkan analisis; stage lain mengisi nilai fallback sendiri.
+        
+        Stage di CONCURRENT_STAGES dikirim ke thread pool begitu dependensinya
+        selesai, jadi latensi prediksi + berita + peer + LLM menjadi kira-kira
+        yang paling lambat, bukan jumlahnya. Stage yang melewati batas waktunya
+        diisi fallback (thread-nya dibiarkan selesai di background).
+        
+        result["Timings"] berisi waktu (detik) dan counter per stage: cache_hits,
+        cache_misses, memo_hits, memo_misses, network_calls, errors dan
+        timeouts. Agregat proses ada di utils.metrics.metrics.
+        """
         start_time = time.time()
+        stages = self.resolve_stages(sections)
+        timings = {}
         
         try:
-            # Load data
-            df, stock = self.loader.load(self.ticker)
-            info = stock.info
-
-            # Core analysis
-            fund_result = self.fund.analyze(info)
-            tech_result = self.tech.calculate(df)
-            div_result = self.div.analyze(info)
-
-            # Calculate scores
-            final_score = self.score_engine.final_score(
-                fund_result.get("FundamentalScore", 0),
-                tech_result.get("TechnicalRating", {}).get("Raw", 0)
-            )
-            label = self.score_engine.label(final_score)
-
-            # Build initial result
-            result = {
-                "Ticker": self.ticker,
-                **fund_result,
-                **tech_result,
-                "DividendYield": div_result.get("Yield", 0),
-                "FinalScore": final_score,
-                "Label": label,
-                "CurrentPrice": df['Close'].iloc[-1] if not df.empty else 0
-            }
-
-            # ✅ Conservative Price Prediction with Trading Scenarios
-            try:
-                if not df.empty and len(df) > 10:
-                    # Get conservative prediction using the correct method name
-                    price_prediction = self.predictor.predict_with_volatility_model(df, days=5)
-                    
-                    # Get trading scenarios
-                    trading_scenarios = self.predictor.generate_trading_scenarios(df)
-                    
-                    result["PricePrediction"] = {
-                        **price_prediction,
-                        "trading_scenarios": trading_scenarios,
-                        "warning": "⚠️ PREDIKSI HARGA BUKAN REKOMENDASI TRADING. Gunakan hanya sebagai alat bantu analisis teknis. Performa masa lalu tidak menjamin hasil masa depan."
-                    }
+            state = {}
+            result = {"Ticker": self.ticker}
+            outputs = {}
+            pending = {}
+            for name in stages:
+                if name in self.CONCURRENT_STAGES:
+                    # Snapshot result diambil di thread ini; stage menulis ke salinannya sendiri
+                    future = self.context.stage_executor.submit(self._run_stage, name, state, dict(result), timings)
+                    pending[name] = (future, time.time() + self.CONCURRENT_STAGES[name])
                 else:
-                    result["PricePrediction"] = {
-                        "error": "Data tidak cukup",
-                        "message": "Data historis kurang dari 10 hari untuk prediksi yang akurat.",
-                        "advice": "Kumpulkan lebih banyak data atau gunakan analisis fundamental."
-                    }
-            except Exception as pred_error:
-                result["PricePrediction"] = {
-                    "error": "Prediksi tidak tersedia",
-                    "message": f"Error: {str(pred_error)[:100]}",
-                    "advice": "Fokus pada analisis fundamental dan teknikal saat ini."
-                }
-
-            # ✅ News Sentiment Analysis
-            try:
-                news_analysis = self.news_analyzer.get_news_summary(self.ticker)
-                result["NewsSentiment"] = news_analysis
-            except Exception as news_error:
-                result["NewsSentiment"] = {"error": str(news_error)[:100]}
-
-            # ✅ Peer Comparison Data
-            try:
-                comparison_data = self.peer_comparator.create_comparison_data(
-                    self.ticker, result
-                )
-                result["PeerComparison"] = comparison_data.to_dict('records')
-                
-                # Generate comparison insights
-                insights = self.peer_comparator.get_comparison_insights(comparison_data)
-                result["PeerInsights"] = insights
-            except Exception as comp_error:
-                result["PeerComparison"] = []
-                result["PeerInsights"] = f"Comparison error: {str(comp_error)[:100]}"
-
-            # AI Explanation
-            try:
-                ai_explanation = self.ai.explain(result)
-                result.update({
-                    "AI_Rule": ai_explanation.get("rule_based", "No rule-based explanation available"),
-                    "AI_LLM": ai_explanation.get("llm_explanation", ""),
-                    "AI_Final": ai_explanation.get("hybrid", ai_explanation.get("rule_based", "No analysis available")),
-                })
-            except Exception as ai_error:
-                result.update({
-                    "AI_Rule": "AI explanation failed",
-                    "AI_LLM": "",
-                    "AI_Final": f"Analysis completed with limited AI insights. Error: {str(ai_error)[:100]}",
-                })
-
-            # Confidence score
-            try:
-                result["Confidence"] = self.confidence.calculate(result)
-            except:
-                result["Confidence"] = 50
-
-            # Risks
-            try:
-                result["Risks"] = self.risk_engine.generate(result)
-            except:
-                result["Risks"] = ["Risk analysis not available"]
-
-            # Scenario analysis
-            try:
-                scenarios = self.scenario.run(result)
-                result.update({
-                    "Scenarios": scenarios,
-                    "ResilienceScore": self.stress.score(scenarios),
-                })
-            except:
-                result.update({
-                    "Scenarios": {},
-                    "ResilienceScore": 50,
-                })
-
-            # Compliance
-            try:
-                result["Disclaimer"] = self.compliance.generate({
-                    "user_type": "retail",
-                    "horizon": "medium"
-                })
-            except:
-                result["Disclaimer"] = "Standard disclaimer: For educational purposes only."
-
+                    outputs[name] = self._run_stage(name, state, result, timings)
+                    result.update(outputs[name])
+            
+            for name, (future, deadline) in pending.items():
+                try:
+                    outputs[name] = future.result(timeout=max(0.0, deadline - time.time()))
+                except FutureTimeoutError:
+                    metrics.incr('timeouts', stage=name, timings=timings)
+                    outputs[name] = {}
+                    getattr(self, f"_fallback_{name}")(
+                        outputs[name], f"Timeout setelah {self.CONCURRENT_STAGES[name]}s")
+                except Exception as stage_error:
+                    metrics.incr('errors', stage=name, timings=timings)
+                    outputs[name] = {}
+                    getattr(self, f"_fallback_{name}")(outputs[name], str(stage_error)[:100])
+            
+            # Urutan key hasil mengikuti urutan stage, sama seperti eksekusi berurutan
+            result = {"Ticker": self.ticker}
+            for name in stages:
+                result.update(outputs[name])
+            
             result["AnalysisTime"] = round(time.time() - start_time, 2)
-
+            result["Timings"] = metrics.freeze(timings)
+            
             return result
-
+        
         except Exception as e:
             return {
                 "Ticker": self.ticker,
@@ -186,8 +154,179 @@ class StockAnalyzer:
                 "ResilienceScore": 0,
                 "Disclaimer": "Analysis unavailable due to technical error.",
                 "AnalysisTime": round(time.time() - start_time, 2),
+                "Timings": metrics.freeze(timings),
                 "PricePrediction": {
                     "error": "System error",
                     "message": "Analisis sistem tidak dapat berjalan sepenuhnya"
                 }
             }
+    
+    def _run_stage(self, name: str, state: dict, base: dict, timings: dict = None) -> dict:
+        """Jalankan satu stage di atas salinan base, return key yang ditambah/diubah stage itu"""
+        view = dict(base)
+        with metrics.stage(name, timings):
+            getattr(self, f"_stage_{name}")(state, view)
+        return {key: value for key, value in view.items() if key not in base or base[key] is not value}
+    
+    # ========== CORE STAGES ==========
+    
+    def _stage_data(self, state: dict, result: dict):
+        # Load data
+        df, stock = self.loader.load(self.ticker)
+        state["df"] = df
+        state["stock"] = stock
+        
+        # Fitur harga dihitung sekali, dipakai bersama oleh engine teknikal dan prediksi
+        state["features"] = FeatureBlock.from_frame(df)
+        result["CurrentPrice"] = df['Close'].iloc[-1] if not df.empty else 0
+    
+    def _stage_fundamental(self, state: dict, result: dict):
+        state["info"] = state["stock"].info
+        result.update(self.fund.analyze(state["info"]))
+    
+    def _stage_technical(self, state: dict, result: dict):
+        # calculate (bukan state streaming): hasil hanya bergantung pada window df ini, sama
+        # dengan technical_scan, dan ikut memo frame
+        result.update(self.tech.calculate(state["df"], features=state["features"]))
+    
+    def _stage_dividend(self, state: dict, result: dict):
+        div_result = self.div.analyze(state["info"])
+        result["DividendYield"] = div_result.get("Yield", 0)
+    
+    def _stage_score(self, state: dict, result: dict):
+        final_score = self.score_engine.final_score(
+            result.get("FundamentalScore", 0),
+            result.get("TechnicalRating", {}).get("Raw", 0)
+        )
+        result["FinalScore"] = final_score
+        result["Label"] = self.score_engine.label(final_score)
+    
+    # ========== ENHANCEMENT STAGES ==========
+    
+    def _stage_prediction(self, state: dict, result: dict):
+        # ✅ Conservative Price Prediction with Trading Scenarios
+        df = state["df"]
+        features = state["features"]
+        try:
+            if not df.empty and len(df) > 10:
+                # Get conservative prediction using the correct method name
+                price_prediction = self.predictor.predict_with_volatility_model(
+                    df, days=5, features=features, ticker=self.ticker)
+                
+                # Get trading scenarios
+                trading_scenarios = self.predictor.generate_trading_scenarios(df, features=features)
+                
+                result["PricePrediction"] = {
+                    **price_prediction,
+                    "trading_scenarios": trading_scenarios,
+                    "warning": "⚠️ PREDIKSI HARGA BUKAN REKOMENDASI TRADING. Gunakan hanya sebagai alat bantu analisis teknis. Performa masa lalu tidak menjamin hasil masa depan."
+                }
+            else:
+                result["PricePrediction"] = {
+                    "error": "Data tidak cukup",
+                    "message": "Data historis kurang dari 10 hari untuk prediksi yang akurat.",
+                    "advice": "Kumpulkan lebih banyak data atau gunakan analisis fundamental."
+                }
+        except Exception as pred_error:
+            metrics.incr('errors')
+            self._fallback_prediction(result, str(pred_error)[:100])
+    
+    def _fallback_prediction(self, result: dict, error: str):
+        result["PricePrediction"] = {
+            "error": "Prediksi tidak tersedia",
+            "message": f"Error: {error}",
+            "advice": "Fokus pada analisis fundamental dan teknikal saat ini."
+        }
+    
+    def _stage_news(self, state: dict, result: dict):
+        # ✅ News Sentiment Analysis
+        try:
+            news_analysis = self.news_analyzer.get_news_summary(self.ticker)
+            result["NewsSentiment"] = news_analysis
+        except Exception as news_error:
+            metrics.incr('errors')
+            self._fallback_news(result, str(news_error)[:100])
+    
+    def _fallback_news(self, result: dict, error: str):
+        result["NewsSentiment"] = {"error": error}
+    
+    def _stage_peers(self, state: dict, result: dict):
+        # ✅ Peer Comparison Data
+        try:
+            comparison_data = self.peer_comparator.create_comparison_data(
+                self.ticker, result
+            )
+            result["PeerComparison"] = comparison_data.to_dict('records')
+            
+            # Generate comparison insights
+            insights = self.peer_comparator.get_comparison_insights(comparison_data)
+            result["PeerInsights"] = insights
+        except Exception as comp_error:
+            metrics.incr('errors')
+            self._fallback_peers(result, str(comp_error)[:100])
+    
+    def _fallback_peers(self, result: dict, error: str):
+        result["PeerComparison"] = []
+        result["PeerInsights"] = f"Comparison error: {error}"
+    
+    def _stage_explanation(self, state: dict, result: dict):
+        # AI Explanation
+        try:
+            ai_explanation = self.ai.explain(result)
+            result.update({
+                "AI_Rule": ai_explanation.get("rule_based", "No rule-based explanation available"),
+                "AI_LLM": ai_explanation.get("llm_explanation", ""),
+                "AI_Final": ai_explanation.get("hybrid", ai_explanation.get("rule_based", "No analysis available")),
+            })
+        except Exception as ai_error:
+            metrics.incr('errors')
+            self._fallback_explanation(result, str(ai_error)[:100])
+    
+    def _fallback_explanation(self, result: dict, error: str):
+        result.update({
+            "AI_Rule": "AI explanation failed",
+            "AI_LLM": "",
+            "AI_Final": f"Analysis completed with limited AI insights. Error: {error}",
+        })
+    
+    def _stage_confidence(self, state: dict, result: dict):
+        # Confidence score
+        try:
+            result["Confidence"] = self.confidence.calculate(result)
+        except:
+            metrics.incr('errors')
+            result["Confidence"] = 50
+    
+    def _stage_risks(self, state: dict, result: dict):
+        # Risks
+        try:
+            result["Risks"] = self.risk_engine.generate(result)
+        except:
+            metrics.incr('errors')
+            result["Risks"] = ["Risk analysis not available"]
+    
+    def _stage_scenarios(self, state: dict, result: dict):
+        # Scenario analysis
+        try:
+            scenarios = self.scenario.run(result)
+            result.update({
+                "Scenarios": scenarios,
+                "ResilienceScore": self.stress.score(scenarios),
+            })
+        except:
+            metrics.incr('errors')
+            result.update({
+                "Scenarios": {},
+                "ResilienceScore": 50,
+            })
+    
+    def _stage_compliance(self, state: dict, result: dict):
+        # Compliance
+        try:
+            result["Disclaimer"] = self.compliance.generate({
+                "user_type": "retail",
+                "horizon": "medium"
+            })
+        except:
+            metrics.incr('errors')
+            result["Disclaimer"] = "Standard disclaimer: For educational purposes only."
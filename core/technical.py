@@ -1,10 +1,242 @@
+import operator
 import pandas as pd
 import numpy as np
+from core.price_store import price_store
+from core.indicator_state import IndicatorState
+from utils.memo import memoize_frame
+
+# ========== INDICATOR KERNELS ==========
+# Setiap kernel menerima array 2-D (tanggal x ticker) per kolom input dan
+# mengembalikan dict {nama_output: array 2-D}. Series tunggal cukup di-reshape
+# menjadi satu kolom, jadi kernel yang sama dipakai untuk calculate dan panel.
+
+def _ewm(values, alpha=None, span=None):
+    """EMA adjust=False per kolom, setiap kolom mulai dari nilai valid pertamanya"""
+    return pd.DataFrame(values).ewm(alpha=alpha, span=span, adjust=False).mean().to_numpy()
+
+def _rolling(values, window, how):
+    return getattr(pd.DataFrame(values).rolling(window), how)().to_numpy()
+
+def _shift(values, periods=1):
+    shifted = np.full_like(values, np.nan)
+    shifted[periods:] = values[:-periods]
+    return shifted
+
+def _wilder_smooth(seed, values, seed_row, period):
+    """Wilder smoothing sebagai exponential filter (alpha = 1/period) mulai dari seed per kolom"""
+    rows = np.arange(values.shape[0])[:, None]
+    series = np.where(rows > seed_row, values, np.nan)
+    series[seed_row, np.arange(values.shape[1])] = seed
+    return _ewm(series, alpha=1.0 / period)
+
+def _rsi_from_averages(up, down):
+    """RSI dari rata-rata gain/loss, aman untuk down == 0"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100. - 100. / (1. + up / down)
+    
+    # Tanpa penurunan: RSI 100, tanpa pergerakan sama sekali: netral 50
+    rsi = np.where(down == 0, np.where(up > 0, 100., 50.), rsi)
+    return rsi
+
+def wilder_rsi(prices, period=14):
+    """
+    Wilder RSI per kolom untuk matrix harga (tanggal x ticker)
+    
+    Smoothing Wilder (avg = (avg*(period-1) + x) / period) sama dengan EMA
+    alpha=1/period, jadi dihitung dengan ewm sekali jalan, bukan loop per bar.
+    Seed mengikuti implementasi lama (period+1 delta pertama / period) dan
+    setiap kolom di-seed dari bar valid pertamanya sendiri, jadi ticker yang
+    baru listing (NaN di awal) tetap dihitung seperti series tunggal.
+    Bar sebelum seed diisi RSI seed; kolom dengan data kurang dari period+2
+    bar berisi NaN.
+    """
+    n_rows, n_cols = prices.shape
+    rsi = np.full((n_rows, n_cols), np.nan)
+    if n_rows < period + 2:
+        return rsi
+    
+    valid = ~np.isnan(prices)
+    first = np.argmax(valid, axis=0)
+    enough = valid.any(axis=0) & (n_rows - first >= period + 2)
+    if not enough.any():
+        return rsi
+    
+    cols = np.flatnonzero(enough)
+    first = first[cols]
+    deltas = np.diff(prices[:, cols], axis=0, prepend=np.nan)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    
+    # Seed = jumlah period+1 delta pertama (setelah bar valid pertama) / period
+    seed_row = first + period - 1
+    rows = np.arange(n_rows)[:, None]
+    seed_window = (rows > first) & (rows <= first + period + 1)
+    up_seed = np.where(seed_window, gains, 0.0).sum(axis=0) / period
+    down_seed = np.where(seed_window, losses, 0.0).sum(axis=0) / period
+    
+    up = _wilder_smooth(up_seed, gains, seed_row, period)
+    down = _wilder_smooth(down_seed, losses, seed_row, period)
+    
+    values = _rsi_from_averages(up, down)
+    seed_rsi = values[seed_row, np.arange(len(cols))]
+    values = np.where(rows < seed_row, seed_rsi, values)
+    values[rows < first] = np.nan
+    rsi[:, cols] = values
+    return rsi
+
+def _true_range(high, low, close):
+    prev_close = _shift(close)
+    # fmax mengabaikan NaN: bar pertama memakai high - low saja
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+class Indicator:
+    """Indikator terdaftar: kernel vectorized + kolom input + lookback minimum (bar)"""
+    
+    def __init__(self, name: str, kernel, inputs: tuple, lookback: int, outputs: dict):
+        self.name = name
+        self.kernel = kernel
+        self.inputs = tuple(inputs)
+        self.lookback = lookback
+        self.outputs = dict(outputs)  # {nama_output: jumlah desimal}
+    
+    def compute(self, fields: dict) -> dict:
+        """Jalankan kernel; fields berisi array 2-D per kolom input"""
+        return self.kernel(*(fields[name] for name in self.inputs))
+
+# Registry indikator, diisi lewat @register_indicator
+INDICATORS = {}
+
+def register_indicator(name: str, inputs: tuple, lookback: int, outputs: dict):
+    """Daftarkan kernel indikator supaya bisa dipakai TechnicalEngine dan discoring"""
+    def decorator(kernel):
+        INDICATORS[name] = Indicator(name, kernel, inputs, lookback, outputs)
+        return kernel
+    return decorator
+
+@register_indicator("rsi", inputs=("Close",), lookback=16, outputs={"RSI": 2})
+def rsi_kernel(close, period=14):
+    return {"RSI": wilder_rsi(close, period)}
+
+@register_indicator("macd", inputs=("Close",), lookback=35,
+                    outputs={"MACD": 4, "MACDLine": 4, "MACDSignal": 4})
+def macd_kernel(close, fast=12, slow=26, signal=9):
+    line = _ewm(close, span=fast) - _ewm(close, span=slow)
+    signal_line = _ewm(line, span=signal)
+    # "MACD" = histogram (line - signal), sama dengan nilai MACD yang dipakai scoring
+    return {"MACD": line - signal_line, "MACDLine": line, "MACDSignal": signal_line}
+
+@register_indicator("atr", inputs=("High", "Low", "Close"), lookback=15, outputs={"ATR": 4, "ATRPct": 2})
+def atr_kernel(high, low, close, period=14):
+    atr = _ewm(_true_range(high, low, close), alpha=1.0 / period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {"ATR": atr, "ATRPct": atr / close * 100}
+
+@register_indicator("stochastic", inputs=("High", "Low", "Close"), lookback=16,
+                    outputs={"StochK": 2, "StochD": 2})
+def stochastic_kernel(high, low, close, k_period=14, d_period=3):
+    highest = _rolling(high, k_period, "max")
+    lowest = _rolling(low, k_period, "min")
+    span = highest - lowest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = np.where(span > 0, (close - lowest) / span * 100, 50.0)
+    k = np.where(np.isnan(span), np.nan, k)
+    return {"StochK": k, "StochD": _rolling(k, d_period, "mean")}
+
+@register_indicator("obv", inputs=("Close", "Volume"), lookback=21, outputs={"OBV": 0, "OBVTrend": 0})
+def obv_kernel(close, volume, trend_window=20):
+    direction = np.sign(np.nan_to_num(np.diff(close, axis=0, prepend=np.nan)))
+    obv = np.cumsum(direction * np.nan_to_num(volume), axis=0)
+    obv = np.where(np.isnan(close), np.nan, obv)
+    # Perubahan OBV selama trend_window bar: positif = akumulasi
+    return {"OBV": obv, "OBVTrend": obv - _shift(obv, trend_window)}
+
+@register_indicator("adx", inputs=("High", "Low", "Close"), lookback=29,
+                    outputs={"ADX": 2, "PlusDI": 2, "MinusDI": 2})
+def adx_kernel(high, low, close, period=14):
+    up_move = high - _shift(high)
+    down_move = _shift(low) - low
+    missing = np.isnan(up_move) | np.isnan(down_move)
+    plus_dm = np.where(missing, np.nan, np.where((up_move > down_move) & (up_move > 0), up_move, 0.0))
+    minus_dm = np.where(missing, np.nan, np.where((down_move > up_move) & (down_move > 0), down_move, 0.0))
+    
+    alpha = 1.0 / period
+    atr = _ewm(_true_range(high, low, close), alpha=alpha)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = 100 * _ewm(plus_dm, alpha=alpha) / atr
+        minus_di = 100 * _ewm(minus_dm, alpha=alpha) / atr
+        di_sum = plus_di + minus_di
+        dx = np.where(di_sum > 0, 100 * np.abs(plus_di - minus_di) / di_sum, 0.0)
+    dx = np.where(np.isnan(di_sum), np.nan, dx)
+    return {"ADX": _ewm(dx, alpha=alpha), "PlusDI": plus_di, "MinusDI": minus_di}
+
+@register_indicator("vwap", inputs=("High", "Low", "Close", "Volume"), lookback=20,
+                    outputs={"VWAP": 4, "VWAPDist": 2})
+def vwap_kernel(high, low, close, volume, window=20):
+    """VWAP rolling dari harga tipikal bar harian"""
+    typical = (high + low + close) / 3
+    value = _rolling(typical * volume, window, "sum")
+    total = _rolling(volume, window, "sum")
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vwap = np.where(total > 0, value / total, np.nan)
+        return {"VWAP": vwap, "VWAPDist": (close / vwap - 1) * 100}
+
+# Skor teknikal: {output: [(operator, threshold, poin), ...]}. Per output hanya
+# tier pertama yang terpenuhi yang dihitung, misal RSI < 30 -> 2, RSI < 50 -> 1.
+# Contoh tambahan: {"ADX": [(">", 25, 1)], "StochK": [("<", 20, 1)], "OBVTrend": [(">", 0, 1)]}
+DEFAULT_SCORING_RULES = {
+    "RSI": [("<", 30, 2), ("<", 50, 1)],
+    "MACD": [(">", 0, 2)],
+}
+
+_OPERATORS = {
+    "<": operator.lt, "<=": operator.le,
+    ">": operator.gt, ">=": operator.ge,
+}
 
 class TechnicalEngine:
-    def calculate(self, df):
+    DEFAULT_INDICATORS = ("rsi", "macd")
+    MIN_BARS = 20  # Minimum bar sebelum indikator dianggap valid
+    
+    def __init__(self, indicators=None, scoring_rules: dict = None):
+        """
+        Args:
+            indicators: Nama indikator dari INDICATORS yang dihitung (default RSI + MACD)
+            scoring_rules: Aturan skor per output, default DEFAULT_SCORING_RULES
+        """
+        self.indicators = list(indicators or self.DEFAULT_INDICATORS)
+        unknown = [name for name in self.indicators if name not in INDICATORS]
+        if unknown:
+            raise ValueError(f"Unknown indicators: {unknown}. Available: {sorted(INDICATORS)}")
+        self.scoring_rules = scoring_rules or DEFAULT_SCORING_RULES
+    
+    @property
+    def required_columns(self) -> list:
+        """Kolom OHLCV yang dibutuhkan indikator terpilih (untuk membaca price store)"""
+        columns = []
+        for name in self.indicators:
+            columns += [c for c in INDICATORS[name].inputs if c not in columns]
+        return columns
+    
+    def lookback(self) -> int:
+        """Jumlah bar history minimum supaya semua indikator terpilih valid"""
+        return max([self.MIN_BARS] + [INDICATORS[name].lookback for name in self.indicators])
+    
+    def calculate_for_ticker(self, ticker: str):
+        """Hitung indikator langsung dari price store, hanya membaca kolom yang dibutuhkan"""
+        df = price_store.read(ticker, columns=self.required_columns)
+        if df is None:
+            return self._get_default_result()
+        return self.calculate(df)
+    
+    @memoize_frame("technical.calculate", params=lambda self: (tuple(self.indicators), repr(self.scoring_rules)))
+    def calculate(self, df, features=None):
+        """
+        Hitung indikator terpilih dan skor teknikal dari DataFrame
+        
+        features: FeatureBlock dari df (opsional), RSI/MACD dipakai ulang dari sana
+        """
         try:
-            if df.empty or len(df) < 20:
+            if df.empty or len(df) < self.MIN_BARS:
                 return self._get_default_result()
             
             # Pastikan kolom Close ada dan numeric
@@ -15,61 +247,247 @@ class TechnicalEngine:
             if close.isnull().all():
                 return self._get_default_result()
             
-            # Calculate RSI
-            rsi_value = self._calculate_rsi(close)
+            fields = {
+                column: pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float).reshape(-1, 1)
+                for column in self.required_columns if column in df.columns
+            }
             
-            # Calculate MACD
-            macd_value = self._calculate_macd(close)
+            values = {}
+            decimals = {}
+            for name in self.indicators:
+                indicator = INDICATORS[name]
+                if not all(column in fields for column in indicator.inputs):
+                    continue
+                
+                outputs = features.indicator(name) if features is not None else None
+                if outputs is None:
+                    outputs = indicator.compute(fields)
+                
+                for output, series in outputs.items():
+                    values[output] = float(series[-1, 0])
+                decimals.update(indicator.outputs)
             
-            # Calculate score
-            score = 0
-            if rsi_value < 30: score += 2
-            elif rsi_value < 50: score += 1
-
-            if macd_value > 0: score += 2
-
-            return {
-                "RSI": round(float(rsi_value), 2),
-                "MACD": round(float(macd_value), 4),
-                "TechnicalRating": {"Raw": score}
+            result = {
+                output: round(value, decimals.get(output, 4))
+                for output, value in values.items()
             }
+            result["TechnicalRating"] = {"Raw": self._score(values)}
+            return result
             
         except Exception as e:
             return self._get_default_result()
     
-    def _calculate_rsi(self, prices, period=14):
-        """Calculate RSI manually"""
-        deltas = np.diff(prices)
-        seed = deltas[:period+1]
-        up = seed[seed >= 0].sum()/period
-        down = -seed[seed < 0].sum()/period
-        rs = up/down
-        rsi = np.zeros_like(prices)
-        rsi[:period] = 100. - 100./(1.+rs)
-        
-        for i in range(period, len(prices)):
-            delta = deltas[i-1]
-            if delta > 0:
-                upval = delta
-                downval = 0.
-            else:
-                upval = 0.
-                downval = -delta
+    def calculate_streaming(self, ticker: str, df, features=None):
+        """
+        Hitung indikator lewat state streaming yang tersimpan di price store
+        
+        Hanya bar yang lebih baru dari state (atau revisi bar terakhir) yang
+        diterapkan, jadi refresh intraday tidak mengulang seluruh history.
+        State dibangun ulang jika history tidak lagi cocok (misal harga di-adjust).
+        State hanya menyimpan RSI/MACD; indikator lain dihitung lewat calculate.
+        
+        EMA/Wilder di state membawa seluruh bar yang pernah diserap, jadi hasilnya
+        bisa berbeda dari calculate(df) atas window df saja. Pakai hanya untuk
+        jalur yang menambah bar satu per satu (auto-refresh prediksi), bukan
+        untuk skor yang harus sebanding antar ticker.
+        """
+        try:
+            if set(self.indicators) != set(self.DEFAULT_INDICATORS):
+                return self.calculate(df, features=features)
+            
+            if df is None or df.empty or 'Close' not in df.columns:
+                return self._get_default_result()
             
-            up = (up*(period-1) + upval)/period
-            down = (down*(period-1) + downval)/period
-            rs = up/down
-            rsi[i] = 100. - 100./(1.+rs)
-        
-        return rsi[-1]
-    
-    def _calculate_macd(self, prices):
-        """Calculate MACD manually"""
-        exp1 = prices.ewm(span=12, adjust=False).mean()
-        exp2 = prices.ewm(span=26, adjust=False).mean()
-        macd = exp1 - exp2
-        signal = macd.ewm(span=9, adjust=False).mean()
-        return macd.iloc[-1] - signal.iloc[-1]
+            close = pd.to_numeric(df["Close"], errors='coerce').dropna()
+            if close.empty:
+                return self._get_default_result()
+            
+            state = self.update_state(ticker, close)
+            return self._result_from_state(state)
+        except Exception as e:
+            return self.calculate(df, features=features)
+    
+    def update_state(self, ticker: str, close: pd.Series) -> IndicatorState:
+        """Muat state ticker, terapkan bar baru dari close, lalu simpan kembali"""
+        state = IndicatorState.from_dict(price_store.read_state(ticker))
+        if self._state_matches(state, close):
+            changed = state.apply(close) > 0
+        else:
+            state = IndicatorState.from_history(close)
+            changed = True
+        
+        # Tanpa bar baru/revisi harga state di disk sudah sama, tidak perlu ditulis ulang
+        if changed:
+            price_store.write_state(ticker, state.to_dict())
+        return state
+    
+    def _state_matches(self, state, close: pd.Series) -> bool:
+        """State masih sejalan dengan history: tanggal terakhirnya ada dan harga sebelumnya sama"""
+        if state is None or state.last_date is None:
+            return False
+        
+        days = [IndicatorState.date_key(ts) for ts in close.index]
+        if state.last_date not in days:
+            return False
+        
+        # Harga bar sebelum last_date harus sama dengan yang sudah diserap state
+        position = days.index(state.last_date)
+        if position > 0:
+            previous = state.previous_close
+            if previous is None or not np.isclose(previous, close.iloc[position - 1], rtol=1e-9):
+                return False
+        return True
+    
+    def _result_from_state(self, state: IndicatorState):
+        if state.bars < IndicatorState.MIN_BARS or state.rsi is None:
+            return self._get_default_result()
+        
+        values = {
+            "RSI": state.rsi,
+            "MACD": state.macd,
+            "MACDLine": state.ema_fast - state.ema_slow,
+            "MACDSignal": state.signal,
+        }
+        decimals = {**INDICATORS["rsi"].outputs, **INDICATORS["macd"].outputs}
+        
+        result = {output: round(float(value), decimals[output]) for output, value in values.items()}
+        result["TechnicalRating"] = {"Raw": self._score(values)}
+        return result
+    
+    def calculate_panel(self, close_matrix, tickers: list = None, high=None, low=None, volume=None) -> pd.DataFrame:
+        """
+        Hitung indikator terpilih dan skor untuk banyak ticker sekaligus
+        
+        Args:
+            close_matrix: Harga Close (tanggal x ticker), DataFrame atau np.ndarray.
+                Ticker dengan riwayat lebih pendek diisi NaN.
+            tickers: Nama kolom jika close_matrix berupa array
+            high, low, volume: Matrix dengan bentuk sama, untuk indikator yang membutuhkannya
+        
+        Returns:
+            DataFrame index ticker dengan kolom output indikator, TechnicalScore, Bars
+        """
+        if isinstance(close_matrix, pd.DataFrame):
+            tickers = list(close_matrix.columns) if tickers is None else tickers
+        
+        prices = self._as_matrix(close_matrix)
+        if tickers is None:
+            tickers = list(range(prices.shape[1]))
+        
+        # Gap di tengah series diisi harga terakhir; NaN di awal tetap NaN
+        fields = {"Close": pd.DataFrame(prices).ffill().to_numpy()}
+        for column, matrix in (("High", high), ("Low", low)):
+            if matrix is not None:
+                fields[column] = pd.DataFrame(self._as_matrix(matrix)).ffill().to_numpy()
+        if volume is not None:
+            fields["Volume"] = np.nan_to_num(self._as_matrix(volume))
+        
+        bars = (~np.isnan(fields["Close"])).sum(axis=0)
+        n_cols = prices.shape[1]
+        
+        columns = {}
+        for name in self.indicators:
+            indicator = INDICATORS[name]
+            if not all(column in fields for column in indicator.inputs):
+                continue
+            if len(prices) > 0:
+                outputs = indicator.compute(fields)
+                for output, series in outputs.items():
+                    columns[output] = series[-1]
+            else:
+                for output in indicator.outputs:
+                    columns[output] = np.full(n_cols, np.nan)
+        
+        # Sama dengan calculate(): kurang dari MIN_BARS bar -> hasil default
+        default = self._get_default_result()
+        enough = bars >= self.MIN_BARS
+        for output, values in columns.items():
+            fallback = default.get(output, np.nan)
+            columns[output] = np.where(enough & ~np.isnan(values), values, fallback)
+        
+        score = self._score_panel(columns, n_cols)
+        score = np.where(enough, score, default["TechnicalRating"]["Raw"])
+        
+        decimals = {}
+        for name in self.indicators:
+            decimals.update(INDICATORS[name].outputs)
+        
+        result = {output: np.round(values, decimals.get(output, 4)) for output, values in columns.items()}
+        result["TechnicalScore"] = score.astype(int)
+        result["Bars"] = bars
+        return pd.DataFrame(result, index=pd.Index(tickers, name="Ticker"))
+    
+    def _as_matrix(self, values) -> np.ndarray:
+        if isinstance(values, pd.DataFrame):
+            values = values.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        values = np.asarray(values, dtype=float)
+        return values.reshape(-1, 1) if values.ndim == 1 else values
+    
+    @staticmethod
+    def align_panel(frames: dict, column: str = "Close") -> pd.DataFrame:
+        """
+        Susun satu kolom OHLCV banyak ticker menjadi matrix tanggal x ticker
+        
+        Args:
+            frames: Dict {ticker: df} atau {ticker: (df, stock)} seperti hasil DataLoader.load_many
+            column: Kolom yang diambil, misal 'Close' atau 'Volume'
+        """
+        columns = {}
+        for ticker, frame in frames.items():
+            df = frame[0] if isinstance(frame, tuple) else frame
+            if df is None or df.empty or column not in df.columns:
+                continue
+            values = pd.to_numeric(df[column], errors='coerce')
+            # Samakan index antar ticker berdasarkan tanggal saja
+            index = pd.DatetimeIndex(values.index)
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            values.index = index.normalize()
+            columns[ticker] = values[~values.index.duplicated(keep='last')]
+        
+        if not columns:
+            return pd.DataFrame()
+        return pd.concat(columns, axis=1).sort_index()
+    
+    @staticmethod
+    def align_close(frames: dict) -> pd.DataFrame:
+        """Matrix Close tanggal x ticker (lihat align_panel)"""
+        return TechnicalEngine.align_panel(frames, "Close")
+    
+    def _score(self, values: dict) -> int:
+        """Skor teknikal mentah dari scoring_rules; output yang tidak ada atau NaN tidak diberi poin"""
+        score = 0
+        for output, tiers in self.scoring_rules.items():
+            value = values.get(output)
+            if value is None or np.isnan(value):
+                continue
+            for op, threshold, points in tiers:
+                if _OPERATORS[op](value, threshold):
+                    score += points
+                    break
+        return score
+    
+    def _score_panel(self, columns: dict, n_cols: int) -> np.ndarray:
+        """Versi vectorized _score untuk semua ticker sekaligus"""
+        score = np.zeros(n_cols)
+        for output, tiers in self.scoring_rules.items():
+            if output not in columns:
+                continue
+            values = columns[output]
+            with np.errstate(invalid='ignore'):
+                conditions = [_OPERATORS[op](values, threshold) for op, threshold, _ in tiers]
+            score += np.select(conditions, [points for _, _, points in tiers], default=0)
+        return score
+    
+    def _calculate_rsi(self, prices, period=14):
+        """
+        Calculate full Wilder RSI series (vectorized, lihat wilder_rsi)
+        
+        Returns:
+            np.ndarray RSI dengan panjang sama dengan prices (NaN jika data kurang)
+        """
+        prices = np.asarray(prices, dtype=float)
+        return wilder_rsi(prices.reshape(-1, 1), period)[:, 0]
     
     def _get_default_result(self):
         return {
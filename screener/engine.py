@@ -1,13 +1,31 @@
 import pandas as pd
+from core.data_loader import DataLoader
+from core.technical import TechnicalEngine
+from core.context import get_context
+from utils.metrics import metrics
 
 class ScreenerEngine:
-    def analyze_batch(self, tickers: list) -> pd.DataFrame:
+    # Kolom tabel screener + risiko untuk detail (tanpa prediksi, berita, peer dan LLM)
+    BASIC_SECTIONS = ("FinalScore", "Label", "Confidence", "ResilienceScore", "Risks")
+    
+    def analyze_batch(self, tickers: list, sections: list = None) -> pd.DataFrame:
+        """
+        Analisis per ticker; sections diteruskan ke StockAnalyzer.analyze
+        (None = analisis lengkap, BASIC_SECTIONS = tabel dasar)
+        """
+        # Prefetch seluruh universe dalam request bulk sebelum analisis per ticker
+        try:
+            with metrics.stage("prefetch"):
+                get_context().loader().load_many(tickers)
+        except Exception as e:
+            print(f"Bulk prefetch failed: {str(e)[:100]}")
+        
         results = []
         for ticker in tickers:
             try:
                 from core.stock import StockAnalyzer
                 analyzer = StockAnalyzer(ticker)
-                result = analyzer.analyze()
+                result = analyzer.analyze(sections=sections)
                 results.append(result)
             except Exception as e:
                 # Add error result
@@ -19,3 +37,25 @@ class ScreenerEngine:
                 })
         
         return pd.DataFrame(results)
+    
+    def technical_scan(self, tickers: list, indicators: list = None, scoring_rules: dict = None) -> pd.DataFrame:
+        """
+        Skor teknikal seluruh universe dalam satu pass array
+        
+        Satu bulk load dengan history secukupnya untuk lookback indikator, lalu
+        semua ticker dihitung sekaligus lewat TechnicalEngine.calculate_panel
+        tanpa membuat StockAnalyzer per ticker.
+        """
+        engine = TechnicalEngine(indicators, scoring_rules)
+        loader = DataLoader(DataLoader.period_for_bars(engine.lookback()))
+        frames = loader.load_many(tickers)
+        
+        close = engine.align_panel(frames, "Close")
+        extra = {}
+        for column in ("High", "Low", "Volume"):
+            if column in engine.required_columns:
+                extra[column.lower()] = engine.align_panel(frames, column).reindex(
+                    index=close.index, columns=close.columns)
+        
+        panel = engine.calculate_panel(close, **extra)
+        return panel.sort_values("TechnicalScore", ascending=False)
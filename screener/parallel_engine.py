@@ -1,31 +1,120 @@
+import math
+import os
 import pandas as pd
+import multiprocessing
 import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+from core.context import get_context, reset_context
+from utils.metrics import metrics
+from utils.http_pool import session_pool
+
+def analyze_ticker(ticker: str, sections: list = None) -> dict:
+    """Analisis satu ticker dengan engine dari AnalysisContext proses ini"""
+    try:
+        from core.stock import StockAnalyzer
+        analyzer = StockAnalyzer(ticker)
+        return analyzer.analyze(sections=sections)
+    except Exception as e:
+        return {
+            "Ticker": ticker,
+            "Error": str(e),
+            "FinalScore": 0,
+            "Label": "ERROR"
+        }
+
+# ========== PROCESS WORKERS ==========
+# Fungsi level modul supaya bisa di-pickle ke proses worker
+
+def _init_worker():
+    """Warm state per worker: import engine dan bangun AnalysisContext sekali per proses"""
+    from utils.cache import cache
+    from core.price_store import price_store
+    from utils.ticker_resolver import ticker_resolver
+    
+    # Cache, price store dan resolver milik proses utama: worker hanya membaca.
+    # Tanpa ini tiap worker menjalankan sweeper sendiri dan menimpa index.json saat exit.
+    cache.make_read_only()
+    price_store.read_only = True
+    ticker_resolver.read_only = True
+    
+    # Context warisan fork membawa thread pool yang thread-nya tidak ikut ke proses anak
+    reset_context()
+    from core.stock import StockAnalyzer  # noqa: F401
+    get_context()
+
+def _analyze_chunk(tickers: list, sections: list = None) -> list:
+    return [analyze_ticker(ticker, sections) for ticker in tickers]
 
 class ParallelScreener:
-    def run(self, tickers: list) -> pd.DataFrame:
-        def analyze_ticker(ticker):
+    """
+    Screener paralel per ticker
+    - mode "thread": cocok saat analisis menunggu network (default)
+    - mode "process": ticker dibagi per chunk ke ProcessPoolExecutor untuk
+      scoring CPU-bound (pandas/NumPy + rule engine) yang tertahan GIL
+    - Universe (history + info fundamental) di-prefetch sekali di proses utama;
+      worker hanya membaca price store dan cache disk yang sama (read-only)
+    - Hasil selalu berurutan sesuai input ticker
+    """
+    
+    MODES = ("thread", "process")
+    CHUNKS_PER_WORKER = 4  # Chunk lebih kecil dari bagian rata supaya beban worker seimbang
+    
+    def __init__(self, max_workers: int = None, mode: str = "thread",
+                 chunk_size: int = None, start_method: str = "spawn"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown mode: {mode} (pilih {', '.join(self.MODES)})")
+        
+        self.mode = mode
+        if mode == "process":
+            # Default: satu worker per core
+            self.max_workers = max_workers or os.cpu_count() or 1
+        else:
+            # Default: sama dengan ukuran pool HTTP, jadi tiap worker punya koneksi keep-alive
+            self.max_workers = max_workers or session_pool.size
+        self.chunk_size = chunk_size
+        # spawn: proses utama punya thread hidup (stage executor, sweeper) yang tidak aman di-fork
+        self.start_method = start_method
+    
+    def run(self, tickers: list, sections: list = None) -> pd.DataFrame:
+        """Analisis paralel per ticker; sections sama seperti ScreenerEngine.analyze_batch"""
+        # Prefetch seluruh universe dalam request bulk sebelum analisis per ticker
+        try:
+            with metrics.stage("prefetch"):
+                loader = get_context().loader()
+                loaded = loader.load_many(tickers)
+                if self.mode == "process":
+                    # Worker read-only tidak bisa menyimpan info: ambil dan simpan di sini
+                    loader.load_info_many(loaded)
+        except Exception as e:
+            print(f"Bulk prefetch failed: {str(e)[:100]}")
+        
+        if self.mode == "process" and len(tickers) > 1:
             try:
-                from core.stock import StockAnalyzer
-                analyzer = StockAnalyzer(ticker)
-                return analyzer.analyze()
-            except Exception as e:
-                return {
-                    "Ticker": ticker,
-                    "Error": str(e),
-                    "FinalScore": 0,
-                    "Label": "ERROR"
-                }
+                results = self._run_processes(tickers, sections)
+            except BrokenProcessPool as e:
+                print(f"Process pool failed, falling back to threads: {str(e)[:100]}")
+                results = self._run_threads(tickers, sections)
+        else:
+            results = self._run_threads(tickers, sections)
         
-        results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            future_to_ticker = {
-                executor.submit(analyze_ticker, ticker): ticker 
-                for ticker in tickers
-            }
-            
-            for future in concurrent.futures.as_completed(future_to_ticker):
-                result = future.result()
-                if result:
-                    results.append(result)
+        return pd.DataFrame([result for result in results if result])
+    
+    def _run_threads(self, tickers: list, sections: list = None) -> list:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # map menjaga urutan input
+            return list(executor.map(lambda ticker: analyze_ticker(ticker, sections), tickers))
+    
+    def _run_processes(self, tickers: list, sections: list = None) -> list:
+        workers = min(self.max_workers, len(tickers))
+        chunk_size = self.chunk_size or max(1, math.ceil(len(tickers) / (workers * self.CHUNKS_PER_WORKER)))
+        chunks = [tickers[start:start + chunk_size] for start in range(0, len(tickers), chunk_size)]
+        sections = list(sections) if sections is not None else None
         
-        return pd.DataFrame(results)
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_init_worker
+        ) as executor:
+            # map mengembalikan chunk sesuai urutan submit, jadi hasil tetap urut ticker
+            chunk_results = executor.map(_analyze_chunk, chunks, [sections] * len(chunks))
+            return [result for chunk in chunk_results for result in chunk]
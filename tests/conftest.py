@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Cache dan price store dibuat relatif ke cwd saat modul di-import: jangan sentuh cache/ project
+os.chdir(tempfile.mkdtemp(prefix="warren_tests_"))
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from core.data_loader import DataLoader
+from core.price_store import price_store
+
+def ohlcv(index, start=100.0):
+    close = start + np.arange(len(index), dtype=float)
+    return pd.DataFrame({
+        'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close, 'Volume': 1000.0,
+    }, index=index)
+
+def test_merge_naive_cached_with_aware_new_bars():
+    # Cache dari yf.download (naive), bar baru dari Ticker.history (Asia/Jakarta)
+    cached = ohlcv(pd.bdate_range(end="2026-10-01", periods=30))
+    new = ohlcv(pd.bdate_range(start="2026-10-01", periods=3, tz="Asia/Jakarta"), start=500.0)
+    
+    df = DataLoader("3mo")._merge_history(cached, new)
+    
+    assert df.index.tz is None
+    assert len(df) == 32
+    assert df.index.is_unique and df.index.is_monotonic_increasing
+    # Bar 2026-10-01 direvisi oleh bar baru, tanggal lokal bursa dipertahankan
+    assert df.loc["2026-10-01", "Close"] == 500.0
+    assert df.index[-1] == pd.Timestamp("2026-10-05")
+
+def test_merge_aware_cached_with_naive_new_bars():
+    cached = ohlcv(pd.bdate_range(end="2026-10-01", periods=30, tz="Asia/Jakarta"))
+    new = ohlcv(pd.bdate_range(start="2026-10-01", periods=2), start=500.0)
+    
+    df = DataLoader("3mo")._merge_history(cached, new)
+    
+    assert df.index.tz is None
+    assert len(df) == 31
+
+def test_store_writes_naive_index():
+    aware = ohlcv(pd.bdate_range(end="2026-10-01", periods=30, tz="Asia/Jakarta"))
+    
+    df, _ = DataLoader("3mo")._store("TZTEST.JK", "TZTEST.JK", aware)
+    
+    assert df.index.tz is None
+    assert price_store.read("TZTEST.JK").index.tz is None
+    assert price_store.read("TZTEST.JK").index[-1] == pd.Timestamp("2026-10-01")
@@ -43,7 +43,15 @@ def render_basic_analysis():
         with col2:
             st.markdown("### ⚙️ Settings")
             use_parallel = st.checkbox("Parallel Processing", value=False)
-            enable_ai_features = st.checkbox("Enable AI Features", value=True)
+            parallel_mode = st.radio(
+                "Parallel mode", ["thread", "process"], horizontal=True,
+                disabled=not use_parallel,
+                help="process: bagi ticker ke beberapa proses untuk universe besar (CPU-bound)"
+            )
+            enable_ai_features = st.checkbox(
+                "Enable AI Features", value=False,
+                help="Prediksi harga, berita, peer dan penjelasan AI per saham (lebih lambat)"
+            )
             st.markdown("---")
             run_analysis = st.button(
                 "🚀 **Run Analysis**", 
@@ -68,11 +76,14 @@ def render_basic_analysis():
     
     status_text.text(f"🔍 Starting analysis of {len(tickers)} stocks...")
     
+    # Tanpa fitur AI hanya stage untuk kolom tabel yang dijalankan
+    sections = None if enable_ai_features else ScreenerEngine.BASIC_SECTIONS
+    
     try:
         if use_parallel:
-            df = ParallelScreener().run(tickers)
+            df = ParallelScreener(mode=parallel_mode).run(tickers, sections=sections)
         else:
-            df = ScreenerEngine().analyze_batch(tickers)
+            df = ScreenerEngine().analyze_batch(tickers, sections=sections)
     except Exception as e:
         st.error(f"❌ Analysis failed: {str(e)}")
         return
@@ -98,15 +109,30 @@ def render_ai_predictions():
     """Render AI prediction features"""
     st.markdown("## 🤖 AI Price Predictions")
     
-    ticker = st.text_input("Enter ticker for prediction:", "BBCA.JK").upper()
+    ticker_input = st.text_input("Enter ticker(s) for prediction (comma separated):", "BBCA.JK").upper()
+    tickers = [t.strip() for t in ticker_input.split(",") if t.strip()]
     
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1:
         prediction_days = st.slider("Prediction days:", 3, 10, 5)
     with col2:
+        max_workers = st.slider("Workers:", 1, 8, 3, help="Thread untuk fetch harga per ticker")
+    with col3:
         run_prediction = st.button("🔮 Predict Price", type="primary")
     
-    if run_prediction and ticker:
+    if run_prediction and len(tickers) > 1:
+        # Banyak ticker: satu batch (load bulk + simulasi bersama)
+        with st.spinner(f"Running AI prediction for {len(tickers)} tickers..."):
+            try:
+                from core.context import get_context
+                predictions = get_context().predictor.predict_many(
+                    tickers, days=prediction_days, max_workers=max_workers)
+                display_batch_predictions(predictions)
+            except Exception as e:
+                st.error(f"Prediction failed: {str(e)}")
+    
+    elif run_prediction and tickers:
+        ticker = tickers[0]
         with st.spinner("Running AI prediction..."):
             try:
                 from core.stock import StockAnalyzer
@@ -121,6 +147,37 @@ def render_ai_predictions():
             except Exception as e:
                 st.error(f"Prediction failed: {str(e)}")
 
+def display_batch_predictions(predictions):
+    """Tabel hasil ConservativePricePredictor.predict_many"""
+    if predictions is None or predictions.empty:
+        st.warning("Tidak ada prediksi")
+        return
+    
+    failed = predictions[predictions['Error'].notna()]
+    success = predictions[predictions['Error'].isna()]
+    
+    if not success.empty:
+        columns = ['Ticker', 'CurrentPrice', 'NextDay', 'P5', 'P50', 'P95',
+                   'TrendPct', 'Trend', 'Confidence', 'VolatilityPct', 'PriceSource']
+        st.dataframe(
+            success[columns].sort_values('TrendPct', ascending=False),
+            column_config={
+                'CurrentPrice': st.column_config.NumberColumn("Harga", format="Rp %.0f"),
+                'NextDay': st.column_config.NumberColumn("Besok", format="Rp %.0f"),
+                'P5': st.column_config.NumberColumn("P5", format="Rp %.0f"),
+                'P50': st.column_config.NumberColumn("P50", format="Rp %.0f"),
+                'P95': st.column_config.NumberColumn("P95", format="Rp %.0f"),
+                'TrendPct': st.column_config.NumberColumn("Trend %", format="%.2f%%"),
+                'Confidence': st.column_config.NumberColumn("Confidence", format="%.0f%%"),
+                'VolatilityPct': st.column_config.NumberColumn("Volatility", format="%.2f%%"),
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+    
+    for _, row in failed.iterrows():
+        st.warning(f"{row['Ticker']}: {row['Error']}")
+
 def render_peer_comparison():
     """Render peer comparison features"""
     st.markdown("## 📈 Peer Comparison")
@@ -131,14 +188,13 @@ def render_peer_comparison():
         with st.spinner("Analyzing peers..."):
             try:
                 from core.stock import StockAnalyzer
-                from ai.peer_comparator import PeerComparator
                 
                 # Analyze main ticker
                 analyzer = StockAnalyzer(main_ticker)
                 result = analyzer.analyze()
                 
-                # Get comparison data
-                comparator = PeerComparator()
+                # Get comparison data (comparator bersama dari context analyzer)
+                comparator = analyzer.peer_comparator
                 comparison_df = comparator.create_comparison_data(main_ticker, result)
                 
                 # Display comparison
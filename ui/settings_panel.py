@@ -0,0 +1,81 @@
+import streamlit as st
+import pandas as pd
+
+from utils.metrics import metrics
+
+# Modul dengan statistik sendiri mendaftarkan collector saat di-import
+import utils.cache
+import utils.memo
+import utils.rate_limiter
+import utils.singleflight
+import utils.http_pool
+import core.price_store
+
+def settings_panel():
+    st.header("⚙️ Settings")
+    
+    tab1, tab2 = st.tabs(["⏱️ Performance Metrics", "🗄️ Cache"])
+    
+    snapshot = metrics.snapshot()
+    
+    with tab1:
+        render_stage_metrics(snapshot)
+    
+    with tab2:
+        render_cache_stats(snapshot)
+
+def render_stage_metrics(snapshot):
+    """Waktu dan counter per stage analisis (agregat sejak proses berjalan)"""
+    st.markdown("### ⏱️ Stage Timings")
+    
+    stages = snapshot.get('stages', {})
+    if not stages:
+        st.info("💡 Belum ada analisis yang tercatat. Jalankan prediksi atau screener terlebih dahulu.")
+    else:
+        df = pd.DataFrame.from_dict(stages, orient='index')
+        df.index.name = 'Stage'
+        columns = ['runs', 'avg_seconds', 'max_seconds', 'seconds',
+                   'cache_hits', 'cache_misses', 'memo_hits', 'memo_misses',
+                   'network_calls', 'errors', 'timeouts']
+        st.dataframe(
+            df[[c for c in columns if c in df.columns]].sort_values('seconds', ascending=False),
+            use_container_width=True
+        )
+    
+    if st.button("🔄 Reset Metrics"):
+        metrics.reset()
+        st.rerun()
+    
+    with st.expander("📄 Text exposition (/metrics)"):
+        st.code(metrics.render_text(), language="text")
+        st.caption("Set WARREN_METRICS_PORT untuk membuka endpoint HTTP /metrics")
+
+def render_cache_stats(snapshot):
+    """Statistik cache, memo, rate limiter dan pool HTTP"""
+    collectors = snapshot.get('collectors', {})
+    
+    cache_stats = collectors.get('cache', {})
+    if cache_stats:
+        st.markdown("### 🗄️ Data Cache")
+        col1, col2 = st.columns(2)
+        with col1:
+            memory = cache_stats.get('memory', {})
+            st.metric("Memory hit rate", f"{memory.get('hit_rate', 0):.1%}")
+            st.caption(f"{memory.get('entries', 0)} entries · {memory.get('bytes', 0) / 1024 / 1024:.1f} MB")
+        with col2:
+            disk = cache_stats.get('disk', {})
+            lookups = disk.get('hits', 0) + disk.get('misses', 0)
+            st.metric("Disk hit rate", f"{disk.get('hits', 0) / lookups:.1%}" if lookups else "0.0%")
+            st.caption(f"{disk.get('entries', 0)} entries · {disk.get('bytes', 0) / 1024 / 1024:.1f} MB")
+    
+    memo_stats = collectors.get('memo', {})
+    if memo_stats:
+        st.markdown("### 🧠 Indicator & Prediction Memo")
+        st.metric("Memo hit rate", f"{memo_stats.get('hit_rate', 0):.1%}")
+        st.caption(f"{memo_stats.get('entries', 0)}/{memo_stats.get('max_entries', 0)} entries · "
+                   f"{memo_stats.get('evictions', 0)} evictions")
+    
+    for name in ('price_store', 'rate_limiter', 'singleflight', 'http_pool'):
+        if name in collectors:
+            with st.expander(f"📊 {name}"):
+                st.json(collectors[name])
@@ -1,17 +1,135 @@
 import pickle
 import os
+import json
 import time
+import atexit
 import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from utils.ttl_policy import MarketHoursTTLPolicy
+from utils.metrics import metrics
+
+class MemoryCache:
+    """
+    In-memory LRU tier dengan batas ukuran dalam byte
+    - Ukuran tiap entry dihitung saat disimpan
+    - Entry paling lama tidak dipakai dibuang saat melebihi batas
+    """
+    
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        
+        self._entries = OrderedDict()  # key -> (entry, size)
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        """Get entry and mark it as most recently used"""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[0]
+    
+    def set(self, key, entry, size):
+        """Store entry, evicting least recently used entries when over budget"""
+        with self._lock:
+            self._remove(key)
+            
+            # Entry lebih besar dari seluruh budget tidak disimpan di memory
+            if size > self.max_bytes:
+                return
+            
+            self._entries[key] = (entry, size)
+            self.current_bytes += size
+            
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+    
+    def pop(self, key):
+        """Remove entry if present"""
+        with self._lock:
+            self._remove(key)
+    
+    def _remove(self, key):
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self.current_bytes -= item[1]
+    
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            }
 
 class DataCache:
-    def __init__(self, cache_dir="cache", ttl_hours=24):
+    """
+    Two-tier cache: in-memory LRU di depan file pickle di disk
+    - get: memory dulu, disk hit dipromosikan ke memory
+    - set: write-through ke memory dan disk
+    - Disk dibatasi max_bytes / max_entries dengan eviksi LRU atau LFU
+    - Index ringan (index.json) menyimpan ukuran & akses tiap entry,
+      jadi eviksi tidak perlu listdir + stat semua file
+    - Entry bisa memiliki file pendamping (mis. Parquet di price store) yang
+      ikut dihitung dalam budget dan ikut dihapus saat entry dievict
+    - TTL per data_type bisa diatur lewat ttl_policy (mis. MarketHoursTTLPolicy)
+    - read_only (worker ParallelScreener): hanya membaca, tanpa tulis/hapus/sweep
+    Data yang dikembalikan dari memory adalah objek yang sama, jangan dimutasi.
+    """
+    
+    INDEX_FILE = "index.json"
+    
+    # Entry kadaluarsa data_type ini tidak disapu: penandanya dipakai untuk refresh incremental
+    SWEEP_EXEMPT = ("history",)
+    
+    def __init__(self, cache_dir="cache", ttl_hours=24, memory_max_bytes=64 * 1024 * 1024,
+                 max_bytes=512 * 1024 * 1024, max_entries=10000, eviction_policy="lru",
+                 ttl_policy=None):
         self.cache_dir = cache_dir
         self.ttl_seconds = ttl_hours * 3600
+        self.ttl_policy = ttl_policy  # None = TTL flat ttl_hours untuk semua data_type
+        self.memory = MemoryCache(memory_max_bytes)
+        
+        # Disk budget
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.eviction_policy = eviction_policy  # "lru" atau "lfu"
+        
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_evictions = 0
+        self.expired_swept = 0
         
         # Create cache directory if not exists
         if not os.path.exists(cache_dir):
             os.makedirs(cache_dir)
+        
+        self._index_lock = threading.Lock()
+        self._index_dirty = False
+        self._index = self._load_index()
+        self._index_bytes = sum(meta['size'] for meta in self._index.values())
+        
+        self._sweeper = None
+        self._sweeper_stop = threading.Event()
+        self.read_only = False
     
     def _get_cache_key(self, ticker, data_type):
         """Generate unique cache key"""
@@ -23,44 +141,356 @@ class DataCache:
         key = self._get_cache_key(ticker, data_type)
         return os.path.join(self.cache_dir, f"{key}.pkl")
     
-    def get(self, ticker, data_type):
-        """Get data from cache if exists and not expired"""
+    def get_entry(self, ticker, data_type):
+        """Get raw cache entry (timestamp + data) without TTL check"""
+        key = self._get_cache_key(ticker, data_type)
+        
+        entry = self.memory.get(key)
+        if entry is not None:
+            self._touch(key)
+            metrics.incr('cache_hits')
+            return entry
+        
         cache_path = self._get_cache_path(ticker, data_type)
         
         if not os.path.exists(cache_path):
+            self.disk_misses += 1
+            metrics.incr('cache_misses')
             return None
         
         try:
             with open(cache_path, 'rb') as f:
-                cached_data = pickle.load(f)
-            
+                payload = f.read()
+            entry = pickle.loads(payload)
+        except:
+            self.disk_misses += 1
+            metrics.incr('cache_misses')
+            return None
+        
+        # Promote disk hit ke memory tier
+        self.disk_hits += 1
+        metrics.incr('cache_hits')
+        self.memory.set(key, entry, len(payload))
+        files = entry.get('files', [])
+        self._touch(key, ticker, data_type, len(payload) + self._files_size(files),
+                    self._entry_expiry(entry), files)
+        return entry
+    
+    def expires_at(self, data_type, timestamp):
+        """Epoch saat data_type yang disimpan pada timestamp kadaluarsa"""
+        if self.ttl_policy is not None:
+            return self.ttl_policy.expires_at(data_type, timestamp)
+        return timestamp + self.ttl_seconds
+    
+    def _entry_expiry(self, entry):
+        # Entry lama tanpa expires_at memakai TTL flat
+        if 'expires_at' in entry:
+            return entry['expires_at']
+        return entry.get('timestamp', 0) + self.ttl_seconds
+    
+    def is_expired(self, entry):
+        """Check whether a raw cache entry has passed its expiry"""
+        return time.time() > self._entry_expiry(entry)
+    
+    def get(self, ticker, data_type):
+        """Get data from cache if exists and not expired"""
+        cached_data = self.get_entry(ticker, data_type)
+        
+        if cached_data is None:
+            return None
+        
+        try:
             # Check if cache is expired
-            cache_time = cached_data.get('timestamp', 0)
-            current_time = time.time()
-            
-            if current_time - cache_time > self.ttl_seconds:
-                os.remove(cache_path)  # Remove expired cache
+            if self.is_expired(cached_data):
+                if not self.read_only:
+                    self.delete(ticker, data_type)  # Remove expired cache
                 return None
             
             return cached_data['data']
         except:
             return None
     
-    def set(self, ticker, data_type, data):
-        """Save data to cache"""
+    def set(self, ticker, data_type, data, files=None):
+        """
+        Save data to cache
+        
+        Args:
+            files: File pendamping milik entry ini (dihitung di budget, dihapus saat eviksi)
+        """
+        if self.read_only:
+            return False
+        
         cache_path = self._get_cache_path(ticker, data_type)
         
+        timestamp = time.time()
         cache_data = {
-            'timestamp': time.time(),
+            'timestamp': timestamp,
+            'expires_at': self.expires_at(data_type, timestamp),
             'data': data
         }
+        if files:
+            cache_data['files'] = list(files)
         
         try:
+            payload = pickle.dumps(cache_data)
             with open(cache_path, 'wb') as f:
-                pickle.dump(cache_data, f)
+                f.write(payload)
+            
+            key = self._get_cache_key(ticker, data_type)
+            self.memory.set(key, cache_data, len(payload))
+            self._track(key, ticker, data_type, len(payload) + self._files_size(files or []),
+                        cache_data['expires_at'], files or [])
+            self._enforce_budget()
             return True
         except:
             return False
+    
+    def delete(self, ticker, data_type):
+        """Remove entry from both tiers"""
+        self._delete_key(self._get_cache_key(ticker, data_type))
+    
+    def invalidate(self, ticker=None, data_type=None):
+        """Remove all entries for a ticker (or ticker_* sub-keys) and/or data_type"""
+        with self._index_lock:
+            keys = [
+                key for key, meta in self._index.items()
+                if (ticker is None or meta.get('ticker') == ticker
+                    or str(meta.get('ticker')).startswith(f"{ticker}_"))
+                and (data_type is None or meta.get('data_type') == data_type)
+            ]
+        
+        for key in keys:
+            self._delete_key(key)
+        return len(keys)
+    
+    def _delete_key(self, key):
+        self.memory.pop(key)
+        if self.read_only:
+            return
+        
+        with self._index_lock:
+            meta = self._index.pop(key, None)
+            if meta is not None:
+                self._index_bytes -= meta['size']
+                self._index_dirty = True
+        
+        paths = [os.path.join(self.cache_dir, f"{key}.pkl")]
+        if meta is not None:
+            paths += meta.get('files', [])
+        for path in paths:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError:
+                pass
+    
+    # ========== INDEX & EVICTION ==========
+    
+    def _load_index(self):
+        """Load index dari disk, atau bangun sekali dari isi direktori"""
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        
+        try:
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+            
+            # Index lama menyimpan timestamp tulis; expires_at = timestamp + TTL flat lama
+            for meta in index.values():
+                if 'expires_at' not in meta:
+                    meta['expires_at'] = meta.pop('timestamp', 0) + self.ttl_seconds
+                    self._index_dirty = True
+            return index
+        except:
+            pass
+        
+        index = {}
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pkl'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            index[name[:-4]] = {
+                'ticker': None,
+                'data_type': None,
+                'size': stat.st_size,
+                'expires_at': stat.st_mtime + self.ttl_seconds,
+                'last_access': stat.st_mtime,
+                'hits': 0,
+            }
+        
+        self._index_dirty = True
+        return index
+    
+    def flush_index(self):
+        """Persist index ke disk jika ada perubahan"""
+        if self.read_only:
+            return
+        with self._index_lock:
+            if not self._index_dirty:
+                return
+            snapshot = dict(self._index)
+            self._index_dirty = False
+        
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            self._index_dirty = True
+    
+    def _files_size(self, files):
+        """Total ukuran file pendamping yang ada di disk"""
+        total = 0
+        for path in files:
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        return total
+    
+    def _track(self, key, ticker, data_type, size, expires_at, files=()):
+        with self._index_lock:
+            previous = self._index.get(key)
+            if previous is not None:
+                self._index_bytes -= previous['size']
+            self._index[key] = {
+                'ticker': ticker,
+                'data_type': data_type,
+                'size': size,
+                'expires_at': expires_at,
+                'last_access': time.time(),
+                'hits': 0,
+                'files': list(files),
+            }
+            self._index_bytes += size
+            self._index_dirty = True
+    
+    def _touch(self, key, ticker=None, data_type=None, size=0, expires_at=0, files=()):
+        """Catat akses entry; entry yang belum ada di index (mis. ditulis proses lain) ditambahkan"""
+        with self._index_lock:
+            meta = self._index.get(key)
+            if meta is None:
+                if ticker is None:
+                    return
+                meta = self._index[key] = {
+                    'ticker': ticker,
+                    'data_type': data_type,
+                    'size': size,
+                    'expires_at': expires_at,
+                    'last_access': 0,
+                    'hits': 0,
+                    'files': list(files),
+                }
+                self._index_bytes += size
+            meta['last_access'] = time.time()
+            meta['hits'] = meta.get('hits', 0) + 1
+            self._index_dirty = True
+    
+    def _enforce_budget(self):
+        """Evict entries (LRU/LFU) sampai disk kembali di bawah budget"""
+        with self._index_lock:
+            total_bytes = self._index_bytes
+            if total_bytes <= self.max_bytes and len(self._index) <= self.max_entries:
+                return
+            
+            if self.eviction_policy == "lfu":
+                sort_key = lambda item: (item[1].get('hits', 0), item[1]['last_access'])
+            else:
+                sort_key = lambda item: item[1]['last_access']
+            
+            victims = []
+            remaining = len(self._index)
+            for key, meta in sorted(self._index.items(), key=sort_key):
+                if total_bytes <= self.max_bytes and remaining <= self.max_entries:
+                    break
+                victims.append(key)
+                total_bytes -= meta['size']
+                remaining -= 1
+        
+        for key in victims:
+            self._delete_key(key)
+        self.disk_evictions += len(victims)
+    
+    # ========== BACKGROUND SWEEPER ==========
+    
+    def sweep_expired(self):
+        """Hapus semua entry yang sudah melewati TTL (kecuali data_type di SWEEP_EXEMPT)"""
+        now = time.time()
+        with self._index_lock:
+            expired = [key for key, meta in self._index.items()
+                       if now > meta.get('expires_at', 0)
+                       and meta.get('data_type') not in self.SWEEP_EXEMPT]
+        
+        for key in expired:
+            self._delete_key(key)
+        self.expired_swept += len(expired)
+        
+        self.flush_index()
+        return len(expired)
+    
+    def start_sweeper(self, interval_seconds=300):
+        """Jalankan sweeper periodik di daemon thread (tidak memblokir request)"""
+        if self._sweeper and self._sweeper.is_alive():
+            return
+        
+        def run():
+            while not self._sweeper_stop.wait(interval_seconds):
+                try:
+                    self.sweep_expired()
+                except Exception as e:
+                    print(f"Cache sweep failed: {str(e)[:100]}")
+        
+        self._sweeper_stop.clear()
+        self._sweeper = threading.Thread(target=run, name="cache-sweeper", daemon=True)
+        self._sweeper.start()
+    
+    def stop_sweeper(self):
+        self._sweeper_stop.set()
+    
+    def make_read_only(self):
+        """
+        Pakai cache tanpa menulis ke disk (proses worker yang berbagi cache_dir)
+        - Sweeper berhenti dan index.json tidak ditulis (juga saat exit), jadi
+          index milik proses utama tidak ditimpa worker
+        - set/delete/eviksi tidak menyentuh disk; memory tier tetap dipakai
+        """
+        self.read_only = True
+        self.stop_sweeper()
+    
+    def stats(self):
+        """Hit/miss/eviction counters per tier"""
+        with self._index_lock:
+            disk_entries = len(self._index)
+            disk_bytes = self._index_bytes
+        
+        return {
+            'memory': self.memory.stats(),
+            'disk': {
+                'entries': disk_entries,
+                'bytes': disk_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.disk_hits,
+                'misses': self.disk_misses,
+                'evictions': self.disk_evictions,
+                'expired_swept': self.expired_swept,
+            },
+        }
 
 # Global cache instance
-cache = DataCache()
+# Budget dapat diatur lewat WARREN_CACHE_MEMORY_MB, WARREN_CACHE_MAX_MB,
+# WARREN_CACHE_MAX_ENTRIES dan WARREN_CACHE_EVICTION (lru/lfu)
+cache = DataCache(
+    memory_max_bytes=int(os.getenv("WARREN_CACHE_MEMORY_MB", "64")) * 1024 * 1024,
+    max_bytes=int(os.getenv("WARREN_CACHE_MAX_MB", "512")) * 1024 * 1024,
+    max_entries=int(os.getenv("WARREN_CACHE_MAX_ENTRIES", "10000")),
+    eviction_policy=os.getenv("WARREN_CACHE_EVICTION", "lru"),
+    ttl_policy=MarketHoursTTLPolicy(),
+)
+cache.start_sweeper(interval_seconds=int(os.getenv("WARREN_CACHE_SWEEP_SECONDS", "300")))
+atexit.register(cache.flush_index)
+metrics.register_collector("cache", cache.stats)
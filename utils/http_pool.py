@@ -0,0 +1,82 @@
+import os
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.metrics import metrics
+
+class SessionPool:
+    """
+    Pool requests.Session yang dipakai ulang lintas request
+    - Koneksi keep-alive, jadi handshake TCP+TLS tidak diulang per ticker
+    - Ukuran pool disamakan dengan jumlah worker screener
+    """
+    
+    # Rotate user agents
+    USER_AGENTS = [
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/120.0',
+    ]
+    
+    def __init__(self, size=3):
+        self.size = max(1, int(size))
+        self._sessions = []
+        self._next = 0
+        self._lock = threading.Lock()
+    
+    def _create_session(self):
+        """Create session dengan berbagai headers untuk bypass restrictions"""
+        session = requests.Session()
+        
+        # Connection pool per host cukup untuk semua worker yang berbagi session ini
+        adapter = HTTPAdapter(pool_connections=self.size, pool_maxsize=self.size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        
+        session.headers.update({
+            'User-Agent': random.choice(self.USER_AGENTS),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'DNT': '1',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+            'Sec-Fetch-Dest': 'document',
+            'Sec-Fetch-Mode': 'navigate',
+            'Sec-Fetch-Site': 'none',
+            'Sec-Fetch-User': '?1',
+            'Cache-Control': 'max-age=0',
+        })
+        return session
+    
+    def get(self):
+        """Ambil session dari pool (round-robin, dibuat saat pertama dibutuhkan)"""
+        with self._lock:
+            if len(self._sessions) < self.size:
+                session = self._create_session()
+                self._sessions.append(session)
+                return session
+            
+            session = self._sessions[self._next % len(self._sessions)]
+            self._next += 1
+            return session
+    
+    def close(self):
+        """Tutup semua session (mis. saat shutdown)"""
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions = []
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'sessions': len(self._sessions),
+            }
+
+# Pool global; ukuran diatur lewat WARREN_HTTP_POOL_SIZE (default = worker ParallelScreener)
+session_pool = SessionPool(size=int(os.getenv("WARREN_HTTP_POOL_SIZE", "3")))
+metrics.register_collector("http_pool", session_pool.stats)
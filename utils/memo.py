@@ -0,0 +1,114 @@
+import os
+import copy
+import zlib
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import metrics
+
+def frame_fingerprint(df: pd.DataFrame, tail: int = 20):
+    """
+    Sidik jari murah dari DataFrame harga tanpa hashing seluruh isi
+    - Tanggal terakhir, jumlah baris dan nama kolom
+    - CRC32 dari `tail` baris terakhir semua kolom numerik (bar intraday yang
+      berubah atau revisi harga menghasilkan fingerprint berbeda)
+    """
+    if df is None:
+        return None
+    if len(df) == 0:
+        return (0, tuple(df.columns))
+    
+    tail_values = df.tail(tail).select_dtypes(include='number').to_numpy(dtype=np.float64)
+    checksum = zlib.crc32(np.ascontiguousarray(tail_values).tobytes())
+    return (str(df.index[-1]), len(df), tuple(df.columns), checksum)
+
+class Memoizer:
+    """
+    Cache LRU terbatas untuk hasil komputasi deterministik (indikator, prediksi)
+    - Key: fingerprint input + parameter, jadi rerun Streamlit dan session lain
+      dalam proses yang sama memakai hasil yang sama selama bar tidak berubah
+    - Hasil disalin saat disimpan dan dikembalikan supaya pemanggil bebas mengubahnya
+    """
+    
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get_or_compute(self, key, fn, *args, **kwargs):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                metrics.incr('memo_hits')
+                return copy.deepcopy(self._entries[key])
+            self.misses += 1
+        metrics.incr('memo_misses')
+        
+        result = fn(*args, **kwargs)
+        
+        with self._lock:
+            self._entries[key] = copy.deepcopy(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
+    
+    def clear(self, namespace: str = None):
+        """Hapus semua entry, atau hanya entry satu namespace"""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[key]
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+# Global instance, dibagi semua engine dalam proses
+memo = Memoizer(max_entries=int(os.getenv("WARREN_MEMO_MAX_ENTRIES", "512")))
+metrics.register_collector("memo", memo.stats)
+
+def memoize_frame(namespace: str, params=None, ignore=("features",)):
+    """
+    Decorator untuk method dengan argumen pertama DataFrame
+    
+    Args:
+        namespace: Nama unik per method (bagian dari key)
+        params: Fungsi self -> nilai hashable untuk konfigurasi instance yang
+            mempengaruhi hasil (misal indikator terpilih)
+        ignore: Keyword argument yang tidak masuk key karena diturunkan dari df
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, df, *args, **kwargs):
+            try:
+                key_kwargs = tuple(sorted((k, v) for k, v in kwargs.items() if k not in ignore))
+                key = (namespace, frame_fingerprint(df), args, key_kwargs,
+                       params(self) if params else None)
+                hash(key)
+            except Exception:
+                # Input tidak bisa di-fingerprint: hitung langsung tanpa cache
+                return method(self, df, *args, **kwargs)
+            return memo.get_or_compute(key, method, self, df, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,190 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class MetricsRegistry:
+    """
+    Metrik hot-path per proses: waktu dan counter per stage analisis
+    - stage(name, timings): context manager yang mengukur wall time stage dan
+      menjadikannya stage aktif di thread ini
+    - incr(counter): dicatat ke stage aktif thread pemanggil (cache_hits,
+      cache_misses, memo_hits, memo_misses, network_calls, errors, timeouts);
+      dipanggil dari cache, memo, rate limiter dan LLM client tanpa perlu tahu
+      stage mana yang jalan
+    - Setiap analisis punya dict timings sendiri (result["Timings"]); agregat
+      proses (runs, total/max detik, counter) dibaca UI dan endpoint teks
+    """
+    
+    COUNTERS = ('cache_hits', 'cache_misses', 'memo_hits', 'memo_misses',
+                'network_calls', 'errors', 'timeouts')
+    UNSCOPED = 'unscoped'  # Counter yang terjadi di luar stage mana pun
+    
+    def __init__(self, prefix: str = "warren"):
+        self.prefix = prefix
+        self._stages = {}
+        self._collectors = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._server = None
+    
+    # ========== RECORDING ==========
+    
+    def _new_stage(self) -> dict:
+        return {'runs': 0, 'seconds': 0.0, 'max_seconds': 0.0, **dict.fromkeys(self.COUNTERS, 0)}
+    
+    def _scopes(self) -> list:
+        if not hasattr(self._local, 'scopes'):
+            self._local.scopes = []
+        return self._local.scopes
+    
+    @contextmanager
+    def stage(self, name: str, timings: dict = None):
+        """
+        Ukur satu stage; exception yang lolos dihitung sebagai error lalu diteruskan
+        
+        Args:
+            timings: Dict per analisis yang diisi {name: {seconds, counter...}}
+        """
+        scopes = self._scopes()
+        scopes.append((name, timings))
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.incr('errors')
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            scopes.pop()
+            with self._lock:
+                aggregate = self._stages.setdefault(name, self._new_stage())
+                aggregate['runs'] += 1
+                aggregate['seconds'] += elapsed
+                aggregate['max_seconds'] = max(aggregate['max_seconds'], elapsed)
+                if timings is not None:
+                    entry = timings.setdefault(name, dict.fromkeys(self.COUNTERS, 0))
+                    entry['seconds'] = round(entry.get('seconds', 0.0) + elapsed, 4)
+    
+    def incr(self, counter: str, amount: int = 1, stage: str = None, timings: dict = None):
+        """Tambah counter untuk stage aktif di thread ini (atau stage/timings yang diberikan)"""
+        if stage is not None:
+            name = stage
+        else:
+            scopes = self._scopes()
+            name, timings = scopes[-1] if scopes else (self.UNSCOPED, None)
+        with self._lock:
+            aggregate = self._stages.setdefault(name, self._new_stage())
+            aggregate[counter] = aggregate.get(counter, 0) + amount
+            if timings is not None:
+                entry = timings.setdefault(name, dict.fromkeys(self.COUNTERS, 0))
+                entry[counter] = entry.get(counter, 0) + amount
+    
+    def freeze(self, timings: dict) -> dict:
+        """Salinan timings satu analisis (stage yang timeout bisa masih menulis dari thread lain)"""
+        with self._lock:
+            return {name: dict(values) for name, values in timings.items()}
+    
+    def register_collector(self, name: str, fn):
+        """Sumber statistik tambahan (misal cache.stats) yang ikut ditampilkan"""
+        with self._lock:
+            self._collectors[name] = fn
+    
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+    
+    # ========== READING ==========
+    
+    def snapshot(self) -> dict:
+        """Salinan agregat per stage + hasil semua collector"""
+        with self._lock:
+            stages = {name: dict(values) for name, values in self._stages.items()}
+            collectors = dict(self._collectors)
+        
+        for values in stages.values():
+            values['avg_seconds'] = round(values['seconds'] / values['runs'], 4) if values['runs'] else 0.0
+            values['seconds'] = round(values['seconds'], 4)
+            values['max_seconds'] = round(values['max_seconds'], 4)
+        
+        stats = {}
+        for name, fn in collectors.items():
+            try:
+                stats[name] = fn()
+            except Exception as e:
+                stats[name] = {'error': str(e)[:100]}
+        return {'stages': stages, 'collectors': stats}
+    
+    def render_text(self) -> str:
+        """Eksposisi teks format Prometheus"""
+        snapshot = self.snapshot()
+        lines = []
+        
+        stage_metrics = [('runs', 'stage_runs_total', 'counter'),
+                         ('seconds', 'stage_seconds_total', 'counter'),
+                         ('max_seconds', 'stage_seconds_max', 'gauge')]
+        stage_metrics += [(counter, f"stage_{counter}_total", 'counter') for counter in self.COUNTERS]
+        for key, metric, kind in stage_metrics:
+            lines.append(f"# TYPE {self.prefix}_{metric} {kind}")
+            for name, values in sorted(snapshot['stages'].items()):
+                lines.append(f'{self.prefix}_{metric}{{stage="{name}"}} {values.get(key, 0)}')
+        
+        for name, stats in sorted(snapshot['collectors'].items()):
+            for key, value in self._flatten(stats):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                lines.append(f"{self.prefix}_{name}_{key} {value}")
+        return "\n".join(lines) + "\n"
+    
+    def _flatten(self, stats: dict, parent: str = ""):
+        for key, value in stats.items():
+            key = f"{parent}_{key}" if parent else str(key)
+            if isinstance(value, dict):
+                yield from self._flatten(value, key)
+            else:
+                yield key, value
+    
+    # ========== HTTP ENDPOINT ==========
+    
+    def serve(self, port: int, host: str = "0.0.0.0"):
+        """Endpoint teks /metrics di thread daemon (sekali per proses)"""
+        with self._lock:
+            if self._server is not None:
+                return self._server
+            
+            registry = self
+            
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = registry.render_text().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                
+                def log_message(self, format, *args):
+                    pass  # Jangan spam log per scrape
+            
+            self._server = ThreadingHTTPServer((host, int(port)), Handler)
+            threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+            print(f"Metrics endpoint on http://{host}:{port}/metrics")
+            return self._server
+    
+    def serve_from_env(self):
+        """Jalankan endpoint jika WARREN_METRICS_PORT diset"""
+        port = os.getenv("WARREN_METRICS_PORT")
+        if not port:
+            return None
+        try:
+            return self.serve(int(port))
+        except OSError as e:
+            print(f"Metrics endpoint failed: {str(e)[:100]}")
+            return None
+
+# Registry global, dibagi semua engine dalam proses
+metrics = MetricsRegistry()
@@ -0,0 +1,71 @@
+import os
+import time
+import threading
+
+from utils.metrics import metrics
+
+class TokenBucket:
+    """
+    Thread-safe token bucket untuk membatasi request keluar
+    - rate: token per detik (rata-rata request per detik)
+    - capacity: burst maksimal saat bucket penuh
+    Pemanggil memesan token lebih dulu lalu tidur di luar lock,
+    sehingga antrian dilayani sesuai urutan datang.
+    """
+    
+    def __init__(self, rate=2.0, capacity=5):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+        
+        # Metrics
+        self.acquisitions = 0
+        self.throttled = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+    
+    def acquire(self, tokens=1):
+        """Ambil token, tunggu jika bucket kosong. Returns: detik yang dihabiskan menunggu"""
+        # Setiap token = satu request keluar, dicatat ke stage analisis yang sedang jalan
+        metrics.incr('network_calls', tokens)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            
+            # Token boleh negatif: berarti sudah dipesan oleh pemanggil yang sedang menunggu
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            
+            self.acquisitions += 1
+            if wait > 0:
+                self.throttled += 1
+                self.wait_seconds_total += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'rate_per_second': self.rate,
+                'burst': self.capacity,
+                'acquisitions': self.acquisitions,
+                'throttled': self.throttled,
+                'wait_seconds_total': round(self.wait_seconds_total, 3),
+                'max_wait_seconds': round(self.max_wait_seconds, 3),
+                'avg_wait_seconds': round(self.wait_seconds_total / self.acquisitions, 4) if self.acquisitions else 0.0,
+            }
+
+# Limiter global untuk semua request market data (Yahoo Finance)
+# Dapat diatur lewat WARREN_RATE_LIMIT_PER_SEC dan WARREN_RATE_LIMIT_BURST
+market_data_limiter = TokenBucket(
+    rate=float(os.getenv("WARREN_RATE_LIMIT_PER_SEC", "2")),
+    capacity=float(os.getenv("WARREN_RATE_LIMIT_BURST", "5")),
+)
+metrics.register_collector("rate_limiter", market_data_limiter.stats)
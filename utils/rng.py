@@ -0,0 +1,27 @@
+import zlib
+import hashlib
+import numpy as np
+
+def stable_seed(*parts) -> int:
+    """
+    Seed 64-bit deterministik dari parts (ticker, tanggal bar, parameter, ...)
+
+    Tidak memakai hash() bawaan Python yang diacak per proses
+    (PYTHONHASHSEED), jadi seed sama di semua proses dan worker.
+    """
+    digest = hashlib.sha256(repr(parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+def derive_rng(*parts) -> np.random.Generator:
+    """
+    Generator numpy sendiri per pemanggilan, diturunkan dari parts
+
+    Setiap pemanggil mendapat stream terpisah (tidak berbagi state global
+    np.random), sehingga aman dipakai bersamaan dari banyak thread dan hasilnya
+    identik untuk input yang sama.
+    """
+    return np.random.default_rng(stable_seed(*parts))
+
+def ticker_checksum(ticker: str) -> int:
+    """Angka stabil per ticker (CRC32), pengganti hash(ticker) untuk data dummy"""
+    return zlib.crc32(ticker.upper().strip().encode("utf-8"))
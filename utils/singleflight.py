@@ -0,0 +1,62 @@
+import threading
+
+from utils.metrics import metrics
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Request coalescing: pemanggil bersamaan dengan key yang sama
+    menunggu satu fetch yang sedang berjalan dan berbagi hasilnya
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        
+        self.fetches = 0   # Fetch yang benar-benar dijalankan
+        self.saved = 0     # Fetch yang dihemat karena ikut menunggu
+    
+    def do(self, key, fn, *args, **kwargs):
+        """Jalankan fn sekali per key yang sedang in-flight; pemanggil lain menunggu hasilnya"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.fetches += 1
+            else:
+                self.saved += 1
+        
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'fetches': self.fetches,
+                'saved': self.saved,
+            }
+
+# Global instance, dipakai bersama oleh semua loader
+singleflight = SingleFlight()
+metrics.register_collector("singleflight", singleflight.stats)
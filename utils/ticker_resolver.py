@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import atexit
+import threading
+from utils.cache import cache
+
+class TickerResolver:
+    """
+    Resolusi ticker input user ke symbol Yahoo Finance
+    - Mengingat varian symbol yang berhasil per ticker (positive cache)
+    - Mengingat symbol yang gagal selama negative_ttl (negative cache); respon
+      kosong (sering karena throttling) baru dianggap gagal setelah
+      failure_threshold kali berturut-turut, error "tidak ada data" langsung
+    Disimpan ke disk supaya berlaku lintas restart dan dipakai bersama
+    oleh DataLoader dan ConservativePricePredictor. Penulisan ke disk
+    dikumpulkan (paling sering tiap flush_interval detik, sisanya saat exit).
+    """
+    
+    # Potongan pesan error yfinance yang berarti symbol memang tidak punya data
+    DEFINITIVE_ERRORS = ("delisted", "no timezone found", "no data found", "not found")
+    
+    def __init__(self, path=None, negative_ttl=6 * 3600, failure_threshold=3, flush_interval=5.0):
+        self.path = path or os.path.join(cache.cache_dir, "ticker_resolution.json")
+        self.negative_ttl = negative_ttl
+        self.failure_threshold = failure_threshold
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._misses = {}         # symbol -> respon kosong berturut-turut (hanya di memory)
+        self._dirty = False
+        self._last_save = 0.0
+        self.read_only = False  # Worker ParallelScreener: perubahan hanya di memory
+        
+        data = self._load()
+        self._resolved = data.get('resolved', {})   # ticker -> symbol
+        self._failed = data.get('failed', {})       # symbol -> waktu gagal
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except:
+            return {}
+    
+    def _mark_dirty(self):
+        """Tandai perubahan; tulis ke disk jika flush terakhir sudah lewat flush_interval"""
+        self._dirty = True
+        if time.time() - self._last_save >= self.flush_interval:
+            self._save()
+    
+    def flush(self):
+        """Tulis perubahan yang tertunda ke disk (misal di akhir bulk load)"""
+        with self._lock:
+            if self._dirty:
+                self._save()
+    
+    def _save(self):
+        if self.read_only:
+            return
+        snapshot = {'resolved': dict(self._resolved), 'failed': dict(self._failed)}
+        self._dirty = False
+        self._last_save = time.time()
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            self._dirty = True
+    
+    def candidates(self, ticker: str) -> list:
+        """Daftar format ticker yang dicoba, urut dari yang paling mungkin"""
+        ticker = ticker.upper().strip()
+        ticker_formats = []
+        
+        # Format untuk saham Indonesia
+        if '.JK' not in ticker and not any(x in ticker for x in ['.NS', '.AX', '.L']):
+            ticker_formats.append(f"{ticker}.JK")
+        
+        ticker_formats.append(ticker)
+        
+        # Format alternatif
+        if '.JK' in ticker:
+            base = ticker.replace('.JK', '')
+            ticker_formats.extend([base, f"{base}.NS"])
+        
+        return ticker_formats
+    
+    def resolve(self, ticker: str) -> list:
+        """
+        Symbol yang perlu dicoba untuk ticker ini
+        
+        Returns:
+            [symbol] jika sudah pernah berhasil, selain itu kandidat yang tidak
+            sedang di negative cache (list kosong = semua varian diketahui gagal)
+        """
+        ticker = ticker.upper().strip()
+        with self._lock:
+            symbol = self._resolved.get(ticker)
+        if symbol:
+            return [symbol]
+        
+        return [s for s in self.candidates(ticker) if not self.is_failed(s)]
+    
+    def primary(self, ticker: str) -> str:
+        """Symbol terbaik untuk ticker (tanpa network)"""
+        symbols = self.resolve(ticker)
+        return symbols[0] if symbols else self.candidates(ticker)[0]
+    
+    def is_failed(self, symbol: str) -> bool:
+        with self._lock:
+            failed_at = self._failed.get(symbol)
+            if failed_at is None:
+                return False
+            if time.time() - failed_at > self.negative_ttl:
+                self._failed.pop(symbol, None)
+                return False
+            return True
+    
+    def is_definitive(self, error) -> bool:
+        """Apakah error fetch berarti symbol tidak punya data (bukan gangguan sementara)"""
+        message = str(error).lower()
+        return any(marker in message for marker in self.DEFINITIVE_ERRORS)
+    
+    def record_success(self, ticker: str, symbol: str):
+        ticker = ticker.upper().strip()
+        with self._lock:
+            self._misses.pop(symbol, None)
+            if self._resolved.get(ticker) == symbol and symbol not in self._failed:
+                return
+            self._resolved[ticker] = symbol
+            self._failed.pop(symbol, None)
+            self._mark_dirty()
+    
+    def record_failure(self, symbol: str, ticker: str = None, definitive: bool = False):
+        """
+        Catat symbol yang tidak mengembalikan data; lupakan resolusi lama jika ada
+        
+        Args:
+            definitive: True jika error menyatakan symbol tidak ada/delisted;
+                selain itu symbol baru masuk negative cache setelah failure_threshold kali
+        """
+        with self._lock:
+            misses = self._misses.get(symbol, 0) + 1
+            if not definitive and misses < self.failure_threshold:
+                self._misses[symbol] = misses
+                return
+            
+            self._misses.pop(symbol, None)
+            self._failed[symbol] = time.time()
+            if ticker and self._resolved.get(ticker.upper().strip()) == symbol:
+                self._resolved.pop(ticker.upper().strip(), None)
+            self._mark_dirty()
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'resolved': len(self._resolved),
+                'failed': len(self._failed),
+                'pending_misses': len(self._misses),
+            }
+
+# Global resolver, dipakai bersama oleh semua loader
+ticker_resolver = TickerResolver()
+atexit.register(ticker_resolver.flush)
@@ -0,0 +1,86 @@
+import os
+from datetime import datetime, date, time, timedelta
+from zoneinfo import ZoneInfo
+
+class MarketHoursTTLPolicy:
+    """
+    TTL cache per data_type yang mengikuti jam bursa IDX (Asia/Jakarta)
+    - Selama jam bursa: TTL pendek sesuai seberapa cepat data berubah
+    - Di luar jam bursa (malam, akhir pekan, libur): data valid sampai sesi berikutnya dibuka
+    """
+    
+    TIMEZONE = ZoneInfo("Asia/Jakarta")
+    SESSION_OPEN = time(9, 0)
+    SESSION_CLOSE = time(16, 0)
+    
+    # TTL (detik) selama jam bursa
+    MARKET_HOURS_TTL = {
+        "quote": 30,
+        "prediction": 60,
+        "history": 15 * 60,
+        "news": 30 * 60,
+        "info": 6 * 3600,
+    }
+    
+    # Libur bursa dengan tanggal tetap (bulan, tanggal). Libur yang berpindah
+    # (Idul Fitri, Imlek, Nyepi, cuti bersama, dst.) diisi dari kalender IDX
+    # lewat parameter holidays atau WARREN_IDX_HOLIDAYS="2026-03-20,2026-03-23"
+    FIXED_HOLIDAYS = [
+        (1, 1),    # Tahun Baru
+        (5, 1),    # Hari Buruh
+        (6, 1),    # Hari Lahir Pancasila
+        (8, 17),   # Hari Kemerdekaan
+        (12, 25),  # Natal
+        (12, 31),  # Libur akhir tahun bursa
+    ]
+    
+    def __init__(self, default_ttl=24 * 3600, holidays=None):
+        self.default_ttl = default_ttl
+        
+        if holidays is None:
+            holidays = [d for d in os.getenv("WARREN_IDX_HOLIDAYS", "").split(",") if d.strip()]
+        self.holidays = {date.fromisoformat(str(d).strip()) for d in holidays}
+    
+    def is_trading_day(self, day: date) -> bool:
+        if day.weekday() >= 5:
+            return False
+        if (day.month, day.day) in self.FIXED_HOLIDAYS:
+            return False
+        return day not in self.holidays
+    
+    def is_market_open(self, now: datetime = None) -> bool:
+        now = now or datetime.now(self.TIMEZONE)
+        now = now.astimezone(self.TIMEZONE)
+        
+        if not self.is_trading_day(now.date()):
+            return False
+        return self.SESSION_OPEN <= now.time() < self.SESSION_CLOSE
+    
+    def next_open(self, now: datetime = None) -> datetime:
+        """Waktu pembukaan sesi bursa berikutnya setelah now"""
+        now = now or datetime.now(self.TIMEZONE)
+        now = now.astimezone(self.TIMEZONE)
+        
+        day = now.date()
+        if now.time() >= self.SESSION_OPEN:
+            day += timedelta(days=1)
+        
+        # Cari hari bursa berikutnya (batas aman: libur panjang Lebaran)
+        for _ in range(30):
+            if self.is_trading_day(day):
+                break
+            day += timedelta(days=1)
+        
+        return datetime.combine(day, self.SESSION_OPEN, tzinfo=self.TIMEZONE)
+    
+    def expires_at(self, data_type: str, timestamp: float) -> float:
+        """Epoch saat entry data_type yang disimpan pada timestamp kadaluarsa"""
+        if data_type not in self.MARKET_HOURS_TTL:
+            return timestamp + self.default_ttl
+        
+        now = datetime.fromtimestamp(timestamp, self.TIMEZONE)
+        if self.is_market_open(now):
+            return timestamp + self.MARKET_HOURS_TTL[data_type]
+        
+        # Di luar jam bursa data tidak berubah sampai sesi berikutnya dibuka
+        return self.next_open(now).timestamp()